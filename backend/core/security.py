@@ -0,0 +1,78 @@
+"""
+Startup security checks shared by the API and its tests.
+
+Kept free of FastAPI and app imports so the checks can be exercised
+without loading backend.main.
+"""
+
+import os
+from typing import Iterable, List, Optional
+
+# Secrets the API refuses to start without
+REQUIRED_SECRETS = ("ADMIN_KEY",)
+
+MIN_ADMIN_KEY_LENGTH = 16
+
+# CORS origins used when ALLOWED_ORIGINS is unset (local dev servers, incl. Vite)
+DEV_ALLOWED_ORIGINS = "http://localhost:3000,http://localhost:5173,http://localhost:8080"
+
+# Rejected case-insensitively as ADMIN_KEY values
+_COMMON_WEAK_KEYS = frozenset({"changeme123", "admin", "password", "test", "secret"})
+
+
+def check_required_secrets(names: Iterable[str] = REQUIRED_SECRETS) -> None:
+    """
+    Check that every named secret is set to a non-empty value.
+
+    Args:
+        names: Environment variable names to check
+
+    Raises:
+        RuntimeError: Listing every missing secret
+    """
+    missing_secrets = [name for name in names if not os.getenv(name)]
+    if missing_secrets:
+        raise RuntimeError(f"Missing required secrets: {', '.join(missing_secrets)}")
+
+
+def validate_admin_key(admin_key: str) -> None:
+    """
+    Check that ADMIN_KEY is strong enough to protect admin endpoints.
+
+    Args:
+        admin_key: Configured ADMIN_KEY value
+
+    Raises:
+        RuntimeError: If the key is too short or a common password
+    """
+    if len(admin_key) < MIN_ADMIN_KEY_LENGTH:
+        raise RuntimeError(f"ADMIN_KEY must be at least {MIN_ADMIN_KEY_LENGTH} characters")
+    if admin_key.lower() in _COMMON_WEAK_KEYS:
+        raise RuntimeError("ADMIN_KEY must not be a common password")
+
+
+def parse_allowed_origins(
+    allowed_origins_env: Optional[str],
+    railway_env: Optional[str]
+) -> List[str]:
+    """
+    Parse the comma-separated ALLOWED_ORIGINS value for the CORS middleware.
+
+    Args:
+        allowed_origins_env: ALLOWED_ORIGINS value, or None if unset
+        railway_env: RAILWAY_ENVIRONMENT value, or None if unset
+
+    Returns:
+        Allowed origins (DEV_ALLOWED_ORIGINS when ALLOWED_ORIGINS is unset)
+
+    Raises:
+        ValueError: If a wildcard origin is configured in production
+    """
+    if allowed_origins_env is None:
+        allowed_origins_env = DEV_ALLOWED_ORIGINS
+    allowed_origins = allowed_origins_env.split(",")
+
+    if railway_env == "production" and "*" in allowed_origins:
+        raise ValueError("Wildcard CORS origins not allowed in production")
+
+    return allowed_origins
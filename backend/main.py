@@ -34,6 +34,9 @@ from mcp_server.segmentation_server import handle_mcp_call, MCP_TOOLS, data_stor
 # Import API key verification
 from backend.api.auth import verify_api_key
 
+# Import startup security checks
+from backend.core.security import check_required_secrets, parse_allowed_origins, validate_admin_key
+
 # Import structured logging
 from backend.middleware.logging_config import configure_logging, get_logger, correlation_id_middleware
 
@@ -109,22 +112,13 @@ async def lifespan(app: FastAPI):
     logger.info("application_starting", version="1.0.0", platform="E-Commerce Customer Intelligence API")
 
     # ==================== Security Validation ====================
-    # Validate required secrets
-    required_secrets = ["ADMIN_KEY"]
-    missing_secrets = [s for s in required_secrets if not os.getenv(s)]
-
-    if missing_secrets:
-        logger.error("security_validation_failed", missing_secrets=missing_secrets)
-        raise RuntimeError(f"Missing required secrets: {', '.join(missing_secrets)}")
-
-    # Validate ADMIN_KEY is strong
-    admin_key = os.getenv("ADMIN_KEY")
-    if len(admin_key) < 16:
-        logger.error("security_validation_failed", reason="ADMIN_KEY too short", min_length=16)
-        raise RuntimeError("ADMIN_KEY must be at least 16 characters")
-    if admin_key.lower() in ["changeme123", "admin", "password", "test", "secret"]:
-        logger.error("security_validation_failed", reason="ADMIN_KEY is common password")
-        raise RuntimeError("ADMIN_KEY must not be a common password")
+    # Validate required secrets are set and ADMIN_KEY is strong
+    try:
+        check_required_secrets()
+        validate_admin_key(os.getenv("ADMIN_KEY"))
+    except RuntimeError as e:
+        logger.error("security_validation_failed", reason=str(e))
+        raise
 
     logger.info("security_validation_passed")
 
@@ -429,15 +423,11 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 logger.info("rate_limiting_enabled", default_limit="100/hour")
 
 # CORS middleware - configured from environment
-# Parse comma-separated list of allowed origins
-ALLOWED_ORIGINS = os.getenv(
-    "ALLOWED_ORIGINS",
-    "http://localhost:3000,http://localhost:5173,http://localhost:8080"  # Development defaults (added Vite default port)
-).split(",")
-
-# Validate no wildcard in production
-if os.getenv("RAILWAY_ENVIRONMENT") == "production" and "*" in ALLOWED_ORIGINS:
-    raise ValueError("Wildcard CORS origins not allowed in production")
+# Parse comma-separated list of allowed origins (no wildcard in production)
+ALLOWED_ORIGINS = parse_allowed_origins(
+    os.getenv("ALLOWED_ORIGINS"),
+    os.getenv("RAILWAY_ENVIRONMENT")
+)
 
 # Middleware to fix HTTPS redirects (Railway proxy issue)
 @app.middleware("http")
@@ -0,0 +1,56 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the fuzzy membership kernel.
+
+Optional alternative to the Numba kernel in multi_axis_clustering_engine for
+deployments that would rather not carry LLVM or pay JIT warm-up in
+short-lived processes. Build in place with:
+
+    cythonize -i backend/segmentation/_fuzzy_kernel.pyx
+
+The engine imports it when the compiled module is present and falls back
+to Numba / NumPy otherwise.
+"""
+
+import numpy as np
+
+from libc.math cimport exp, sqrt
+
+
+cpdef fuzzy_weights(
+    const double[:, ::1] centers,
+    const double[::1] mean,
+    const double[::1] scale,
+    const double[::1] x
+):
+    """Same contract as _fuzzy_membership_numpy: exp(-distance) normalized to 1.0."""
+    cdef Py_ssize_t n_segments = centers.shape[0]
+    cdef Py_ssize_t n_features = centers.shape[1]
+    cdef Py_ssize_t i, j
+    cdef double d, diff, total = 0.0
+
+    out = np.empty(n_segments)
+    cdef double[::1] w = out
+
+    z = np.empty(n_features)
+    cdef double[::1] x_scaled = z
+
+    for j in range(n_features):
+        x_scaled[j] = (x[j] - mean[j]) / scale[j]
+
+    for i in range(n_segments):
+        d = 0.0
+        for j in range(n_features):
+            diff = centers[i, j] - x_scaled[j]
+            d += diff * diff
+        w[i] = exp(-sqrt(d))
+        total += w[i]
+
+    if total > 0.0:
+        for i in range(n_segments):
+            w[i] /= total
+    else:
+        for i in range(n_segments):
+            w[i] = 1.0 / n_segments
+
+    return out
@@ -19,7 +19,6 @@ import logging
 from sklearn.preprocessing import RobustScaler
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
-from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +45,15 @@ class ClusteringConfig:
     # Adaptive behavior
     max_rebalance_attempts: int = 3  # How many times to retry with higher k
 
+    # K-search early stopping: stop once silhouette declines twice in a row,
+    # or as soon as a k passes all quality checks. Off by default: the first
+    # passing k is not always the passing k with the best silhouette.
+    early_stop_k_search: bool = False
+
+    # Cast features to float32 before scaling/clustering (halves memory
+    # traffic; fitted scaler params and silhouettes change slightly)
+    use_float32: bool = False
+
     @classmethod
     def from_env(cls) -> 'ClusteringConfig':
         """Load configuration from environment variables"""
@@ -58,6 +66,8 @@ class ClusteringConfig:
             enable_robust_scaling=os.getenv("CLUSTERING_ROBUST_SCALING", "true").lower() == "true",
             winsorize_percentile=float(os.getenv("CLUSTERING_WINSORIZE_PCT", "99.0")),
             max_rebalance_attempts=int(os.getenv("CLUSTERING_MAX_REBALANCE", "3")),
+            early_stop_k_search=os.getenv("CLUSTERING_EARLY_STOP", "false").lower() == "true",
+            use_float32=os.getenv("CLUSTERING_FLOAT32", "false").lower() == "true",
         )
 
 
@@ -105,9 +115,16 @@ class ImprovedClusteringEngine:
         2. Use RobustScaler (median/IQR) instead of StandardScaler (mean/std)
         3. Handle inf/nan values
 
+        With use_float32 enabled, features are cast once to a contiguous
+        float32 matrix, which the scalers, KMeans and silhouette scoring all
+        preserve.
+
         Returns:
             (X_preprocessed, preprocessing_params)
         """
+        if self.config.use_float32:
+            X = np.ascontiguousarray(X, dtype=np.float32)
+
         # Step 1: Handle inf/nan
         X_clean = np.nan_to_num(X, nan=0.0, posinf=np.nan, neginf=np.nan)
 
@@ -177,10 +194,11 @@ class ImprovedClusteringEngine:
         Returns:
             SegmentQualityMetrics with balance assessment
         """
-        # Count segment sizes
-        segment_counts = Counter(labels)
+        # Count segment sizes (one C-level pass; drop empty labels)
+        segment_counts = np.bincount(labels)
+        segment_counts = segment_counts[segment_counts > 0]
         k = len(segment_counts)
-        segment_sizes = list(segment_counts.values())
+        segment_sizes = segment_counts.tolist()
 
         # Calculate percentages
         largest_pct = max(segment_sizes) / n_samples * 100
@@ -216,12 +234,19 @@ class ImprovedClusteringEngine:
         This is the key fix: we don't just optimize silhouette, we also ensure
         segments are balanced and descriptive.
 
+        With early_stop_k_search enabled, the sweep stops at the first k that
+        passes the quality check, or once silhouette has dropped for two
+        consecutive k (past the knee, larger k rarely recovers). This trades
+        fewer KMeans fits for possibly picking a smaller, lower-silhouette k.
+
         Returns:
             (optimal_k, silhouette_score, quality_metrics)
         """
         best_k = self.config.min_k
         best_silhouette = -1
         best_metrics = None
+        silhouette_history = []
+        explored_k = []
 
         logger.info(f"{axis_name}: Testing k-range [{self.config.min_k}, {self.config.max_k}] "
                    f"with balance constraints")
@@ -241,6 +266,9 @@ class ImprovedClusteringEngine:
                 metrics.is_descriptive = silhouette >= self.config.min_silhouette
                 metrics.passes_quality_check = metrics.is_balanced and metrics.is_descriptive
 
+                explored_k.append(k)
+                silhouette_history.append(silhouette)
+
                 logger.debug(f"{axis_name}: k={k}, silhouette={silhouette:.3f}, "
                             f"largest_seg={metrics.largest_segment_pct:.1f}%, "
                             f"smallest_seg={metrics.smallest_segment_pct:.1f}%, "
@@ -263,6 +291,18 @@ class ImprovedClusteringEngine:
                 logger.warning(f"{axis_name}: Failed to evaluate k={k}: {e}")
                 continue
 
+            if self.config.early_stop_k_search:
+                # Good enough: balanced and descriptive, skip higher-k fits
+                if metrics.passes_quality_check:
+                    break
+
+                # Knee: silhouette declined for two consecutive k
+                if (len(silhouette_history) >= 3 and
+                        silhouette_history[-1] < silhouette_history[-2] < silhouette_history[-3]):
+                    break
+
+        logger.info(f"{axis_name}: Explored k={explored_k}")
+
         if best_metrics and not best_metrics.passes_quality_check:
             logger.warning(
                 f"{axis_name}: No balanced solution found! Best k={best_k} has "
@@ -42,7 +42,7 @@ from sqlalchemy import text
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredSegment:
     """A segment discovered within an axis"""
     segment_id: str
@@ -193,6 +193,10 @@ class EcommerceClusteringEngine:
         # Feature extractor will be imported separately
         self.feature_extractor = None
 
+        # Per-axis array views of segment centers/scaler for fuzzy membership
+        # {axis_name: (segments, (centers, center, scale))}
+        self._segment_cache: Dict[str, Tuple[List[DiscoveredSegment], Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+
 
     async def discover_multi_axis_segments(
         self,
@@ -658,6 +662,9 @@ class EcommerceClusteringEngine:
         Returns:
             List of DiscoveredSegment objects
         """
+        # Segments for this axis are being re-fit
+        self._segment_cache.pop(axis_name, None)
+
         # Get features for this axis
         X_dict = customer_features.get(axis_name, {})
 
@@ -850,28 +857,13 @@ class EcommerceClusteringEngine:
         customer_vector = np.nan_to_num(customer_vector, nan=0.0, posinf=1e10, neginf=-1e10)
 
         # Use POPULATION scaler from training
-        scaler_params = segments[0].scaler_params
-        scaler_type = scaler_params.get('type', 'standard')
-
-        if scaler_type == 'robust':
-            # RobustScaler: use center (median) and scale (IQR)
-            center = np.array(scaler_params['center'])
-            scale = np.array(scaler_params['scale'])
-            customer_vector_scaled = (customer_vector - center) / scale
-        else:
-            # StandardScaler: use mean and std
-            mean = np.array(scaler_params.get('mean', scaler_params.get('center', [])))
-            scale = np.array(scaler_params['scale'])
-            customer_vector_scaled = (customer_vector - mean) / scale
+        centers, center, scale = self._get_segment_arrays(segments)
+        customer_vector_scaled = (customer_vector - center) / scale
 
         # Calculate distances to all cluster centers
-        distances = []
-        for segment in segments:
-            dist = np.linalg.norm(customer_vector_scaled - segment.cluster_center)
-            distances.append(dist)
+        distances = np.linalg.norm(centers - customer_vector_scaled, axis=1)
 
         # Convert distances to similarities (exponential decay)
-        distances = np.array(distances)
         similarities = np.exp(-distances)
 
         # Normalize to sum to 1.0
@@ -884,6 +876,42 @@ class EcommerceClusteringEngine:
         }
 
 
+    def _get_segment_arrays(
+        self,
+        segments: List[DiscoveredSegment]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get (centers, center, scale) arrays for an axis's segment list.
+
+        center is the scaler's median (RobustScaler) or mean (StandardScaler).
+        Built once per segment list and cached by axis name; the cached entry
+        is only reused when it was built from this exact list object.
+        """
+        axis_name = segments[0].axis_name
+        cached = self._segment_cache.get(axis_name)
+        if cached is not None and cached[0] is segments:
+            return cached[1]
+
+        scaler_params = segments[0].scaler_params
+        scaler_type = scaler_params.get('type', 'standard')
+
+        if scaler_type == 'robust':
+            # RobustScaler: use center (median) and scale (IQR)
+            center = scaler_params['center']
+        else:
+            # StandardScaler: use mean and std
+            center = scaler_params.get('mean', scaler_params.get('center', []))
+
+        arrays = (
+            np.array([s.cluster_center for s in segments], dtype=np.float64),
+            np.asarray(center, dtype=np.float64),
+            np.asarray(scaler_params['scale'], dtype=np.float64)
+        )
+
+        self._segment_cache[axis_name] = (segments, arrays)
+        return arrays
+
+
     async def _name_segment_with_ai(
         self,
         axis_name: str,
@@ -161,22 +161,74 @@ class FraudAnomalyDetector:
         return None
 
 
+    def compute_value_thresholds(
+        self,
+        population_values: np.ndarray
+    ) -> Tuple[float, float]:
+        """
+        Compute VIP and outlier lifetime-value thresholds for a population.
+
+        Both percentiles come from a single np.percentile call, so callers
+        analyzing many customers against the same population can do this
+        once instead of per customer.
+
+        Returns:
+            (vip_threshold, outlier_threshold)
+        """
+        vip_threshold, outlier_threshold = np.percentile(
+            population_values,
+            [self.value_percentile_vip, self.value_percentile_outlier]
+        )
+        return float(vip_threshold), float(outlier_threshold)
+
+
+    def build_population_stats(
+        self,
+        all_values: np.ndarray,
+        velocity_mean: float = 0.0,
+        velocity_std: float = 1.0
+    ) -> Dict:
+        """
+        Build the population_stats dict for analyze_customer_for_anomalies.
+
+        Precomputes the value thresholds so per-customer analysis doesn't
+        rescan all_values.
+        """
+        population_stats = {
+            'all_values': all_values,
+            'velocity_mean': velocity_mean,
+            'velocity_std': velocity_std
+        }
+
+        if len(all_values) >= 100:
+            vip_threshold, outlier_threshold = self.compute_value_thresholds(all_values)
+            population_stats['vip_threshold'] = vip_threshold
+            population_stats['outlier_threshold'] = outlier_threshold
+
+        return population_stats
+
+
     def detect_value_outliers(
         self,
         customer_id: str,
         lifetime_value: float,
-        population_values: np.ndarray
+        population_values: np.ndarray,
+        vip_threshold: Optional[float] = None,
+        outlier_threshold: Optional[float] = None
     ) -> Optional[AnomalyDetection]:
         """
         Detect extreme value outliers (VIPs or suspicious high spenders).
 
         Top 0.5% by value should be flagged for special attention.
+
+        Pass precomputed thresholds (see build_population_stats) to skip
+        recomputing percentiles over the population on every call.
         """
         if len(population_values) < 100:
             return None
 
-        vip_threshold = np.percentile(population_values, self.value_percentile_vip)
-        outlier_threshold = np.percentile(population_values, self.value_percentile_outlier)
+        if vip_threshold is None or outlier_threshold is None:
+            vip_threshold, outlier_threshold = self.compute_value_thresholds(population_values)
 
         if lifetime_value >= outlier_threshold:
             percentile = (np.sum(population_values < lifetime_value) / len(population_values)) * 100
@@ -299,7 +351,8 @@ class FraudAnomalyDetector:
                 'orders_per_day', 'recent_value', 'historical_avg', ...
             }
             population_stats: {
-                'velocity_mean', 'velocity_std', 'all_values'
+                'velocity_mean', 'velocity_std', 'all_values',
+                'vip_threshold', 'outlier_threshold'  # optional, precomputed
             }
 
         Returns:
@@ -334,7 +387,9 @@ class FraudAnomalyDetector:
             anomaly = self.detect_value_outliers(
                 customer_id,
                 customer_data['lifetime_value'],
-                population_stats['all_values']
+                population_stats['all_values'],
+                vip_threshold=population_stats.get('vip_threshold'),
+                outlier_threshold=population_stats.get('outlier_threshold')
             )
             if anomaly:
                 anomalies.append(anomaly)
@@ -22,11 +22,13 @@ Date: October 14, 2025
 
 import numpy as np
 import logging
+import math
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from collections import defaultdict
+from operator import itemgetter
 import statistics
 import uuid
 import json
@@ -37,6 +39,26 @@ from sklearn.metrics import silhouette_score, davies_bouldin_score
 from scipy.spatial.distance import mahalanobis, cdist
 from scipy.stats import entropy
 
+try:
+    import cupy as cp
+    from cuml.cluster import KMeans as cuKMeans
+    from cuml.metrics.cluster import silhouette_score as cu_silhouette_score
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from backend.segmentation._fuzzy_kernel import fuzzy_weights
+    CYTHON_KERNEL_AVAILABLE = True
+except ImportError:
+    CYTHON_KERNEL_AVAILABLE = False
+
 from backend.core.database import get_db_session
 from backend.segmentation.ecommerce_feature_extraction import EcommerceFeatureExtractor as FeatureExtractor
 from backend.segmentation.ai_segment_naming import name_segment_with_ai
@@ -45,7 +67,108 @@ from sqlalchemy import text
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _fuzzy_membership_numpy(
+    centers: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    x: np.ndarray
+) -> np.ndarray:
+    """
+    Fuzzy membership weights for one (sanitized) feature vector.
+
+    Scales x with the population scaler, takes Euclidean distance to each
+    center and normalizes exp(-distance) to sum to 1.0 (uniform if every
+    similarity underflows to 0).
+    """
+    x_scaled = (x - mean) / scale
+    distances = np.linalg.norm(centers - x_scaled, axis=1)
+
+    # Convert distances to similarities (exponential decay)
+    similarities = np.exp(-distances)
+
+    # Normalize to sum to 1.0
+    total = np.sum(similarities)
+    if total > 0:
+        return similarities / total
+    return np.ones(len(centers)) / len(centers)
+
+
+if CYTHON_KERNEL_AVAILABLE:
+    # Prebuilt extension (see _fuzzy_kernel.pyx): no JIT warm-up
+    _fuzzy_membership_kernel = fuzzy_weights
+elif NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _fuzzy_membership_kernel(centers, mean, scale, x):
+        """JIT-compiled equivalent of _fuzzy_membership_numpy."""
+        n_segments, n_features = centers.shape
+        out = np.empty(n_segments)
+        total = 0.0
+
+        for i in range(n_segments):
+            d = 0.0
+            for j in range(n_features):
+                diff = centers[i, j] - (x[j] - mean[j]) / scale[j]
+                d += diff * diff
+            w = np.exp(-np.sqrt(d))
+            out[i] = w
+            total += w
+
+        if total > 0.0:
+            for i in range(n_segments):
+                out[i] /= total
+        else:
+            for i in range(n_segments):
+                out[i] = 1.0 / n_segments
+
+        return out
+else:
+    _fuzzy_membership_kernel = _fuzzy_membership_numpy
+
+
+def _fuzzy_membership_python(
+    centers: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    x: np.ndarray
+) -> np.ndarray:
+    """
+    Pure-Python equivalent of _fuzzy_membership_numpy for tiny axes.
+
+    With a handful of segments, per-call NumPy dispatch costs more than the
+    arithmetic, so this works on Python floats with math.hypot.
+    """
+    x_scaled = [(xj - mj) / sj for xj, mj, sj in zip(x.tolist(), mean.tolist(), scale.tolist())]
+    similarities = [
+        math.exp(-math.hypot(*[c - z for c, z in zip(center, x_scaled)]))
+        for center in centers.tolist()
+    ]
+
+    total = math.fsum(similarities)
+    if total > 0:
+        return np.array(similarities) / total
+    return np.ones(len(similarities)) / len(similarities)
+
+
+# Largest n_segments * n_features that uses the pure-Python kernel when
+# neither Numba nor the Cython kernel is available. Against the NumPy path
+# it is about 2x faster at (3, 2) and breaks even around 30-32 cells.
+MAX_PYTHON_KERNEL_SIZE = 32
+
+
+def _get_fuzzy_membership_kernel(n_segments: int, n_features: int) -> Callable:
+    """
+    Pick the membership kernel for an (n_segments, n_features) center matrix.
+
+    Without Numba or Cython, small shapes use the pure-Python kernel.
+    Everything else uses _fuzzy_membership_kernel.
+    """
+    if not (NUMBA_AVAILABLE or CYTHON_KERNEL_AVAILABLE):
+        if n_segments * n_features <= MAX_PYTHON_KERNEL_SIZE:
+            return _fuzzy_membership_python
+    return _fuzzy_membership_kernel
+
+
+@dataclass(slots=True)
 class DiscoveredSegment:
     """A segment discovered within an axis"""
     segment_id: str
@@ -110,7 +233,9 @@ class MultiAxisClusteringEngine:
         session_gap_minutes: int = 30,
         # AI naming parameters
         use_ai_naming: bool = True,
-        anthropic_api_key: Optional[str] = None
+        anthropic_api_key: Optional[str] = None,
+        # KMeans backend
+        backend: str = "sklearn"
     ):
         """
         Initialize clustering engine with configurable parameters.
@@ -124,6 +249,9 @@ class MultiAxisClusteringEngine:
             session_gap_minutes: Gap threshold for session detection (default: 30)
             use_ai_naming: Whether to use AI for segment naming (default: True)
             anthropic_api_key: Anthropic API key for AI naming (default: from env)
+            backend: KMeans backend - "sklearn", "cuml" (GPU), or "auto" to use
+                cuML when it is installed and a CUDA device is present. cuML is
+                opt-in; its KMeans differs from sklearn's (default: "sklearn")
         """
         self.db_session = db_session
 
@@ -141,6 +269,45 @@ class MultiAxisClusteringEngine:
         self.use_ai_naming = use_ai_naming
         self.anthropic_api_key = anthropic_api_key or os.getenv('ANTHROPIC_API_KEY')
 
+        # KMeans backend
+        self.backend = self._resolve_backend(backend)
+
+        # Per-axis array views of segment centers/scaler for fuzzy membership
+        # {axis_name: (segments, (centers, mean, scale))}
+        self._segment_cache: Dict[str, Tuple[List[DiscoveredSegment], Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+
+        # Prebuilt dict -> vector getters, keyed by feature name tuple
+        self._feature_getters: Dict[Tuple[str, ...], itemgetter] = {}
+
+        # Column order maps for (names, values) inputs in a different order,
+        # keyed by (input names, axis feature names)
+        self._feature_index_cache: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], np.ndarray] = {}
+
+
+    @staticmethod
+    def _resolve_backend(backend: str) -> str:
+        """Resolve requested KMeans backend to "sklearn" or "cuml"."""
+        if backend not in ("auto", "sklearn", "cuml"):
+            raise ValueError(f"Unknown clustering backend: {backend}")
+
+        if backend == "sklearn":
+            return "sklearn"
+
+        gpu_available = False
+        if CUML_AVAILABLE:
+            try:
+                gpu_available = cp.cuda.runtime.getDeviceCount() > 0
+            except Exception:
+                gpu_available = False
+
+        if gpu_available:
+            return "cuml"
+
+        if backend == "cuml":
+            logger.warning("cuML backend requested but no CUDA device/cuML install found - using sklearn")
+
+        return "sklearn"
+
 
     async def discover_multi_axis_segments(
         self,
@@ -772,6 +939,9 @@ class MultiAxisClusteringEngine:
         # Handle NaN/inf
         X = np.nan_to_num(X, nan=0.0, posinf=1e10, neginf=-1e10)
 
+        # Segments for this axis are being re-fit
+        self._segment_cache.pop(axis_name, None)
+
         # Step 3: Normalize
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X)
@@ -792,8 +962,7 @@ class MultiAxisClusteringEngine:
         )
 
         # Step 5: Cluster
-        kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(X_scaled)
+        labels, cluster_centers = self._fit_kmeans(X_scaled, optimal_k)
 
         # Step 6: Extract scaler parameters for fuzzy membership calculation
         # CRITICAL FIX: Store population scaler params so inference uses same standardization
@@ -804,13 +973,16 @@ class MultiAxisClusteringEngine:
         }
 
         # Step 7: Create segments
+        # Segment sizes from a single pass over labels
+        cluster_counts = np.bincount(labels, minlength=optimal_k)
+        n_customers = len(customer_ids)
+
         segments = []
         for cluster_id in range(optimal_k):
-            cluster_mask = labels == cluster_id
-            cluster_customer_ids = [customer_ids[i] for i, m in enumerate(cluster_mask) if m]
+            cluster_count = int(cluster_counts[cluster_id])
 
             # Interpret cluster
-            cluster_center_scaled = kmeans.cluster_centers_[cluster_id]
+            cluster_center_scaled = cluster_centers[cluster_id]
             cluster_center_original = scaler.inverse_transform(
                 cluster_center_scaled.reshape(1, -1)
             )[0]
@@ -829,8 +1001,8 @@ class MultiAxisClusteringEngine:
                 cluster_center=cluster_center_scaled,  # Store scaled for membership calc
                 feature_names=feature_names,
                 scaler_params=scaler_params,  # FIX: Store population scaler
-                population_percentage=len(cluster_customer_ids) / len(customer_ids),
-                customer_count=len(cluster_customer_ids),
+                population_percentage=cluster_count / n_customers,
+                customer_count=cluster_count,
                 interpretation=interpretation
             )
 
@@ -852,12 +1024,20 @@ class MultiAxisClusteringEngine:
         best_k = 2
         best_silhouette = -1
 
+        if self.backend == "cuml":
+            # Move the axis matrix to the GPU once for the whole k sweep
+            X = cp.asarray(X, dtype=cp.float32)
+
         for k in range(self.min_k, min(self.max_k + 1, len(X))):
             try:
-                kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-                labels = kmeans.fit_predict(X)
+                if self.backend == "cuml":
+                    labels = cuKMeans(n_clusters=k, random_state=42, n_init=10).fit_predict(X)
+                    silhouette = float(cu_silhouette_score(X, labels))
+                else:
+                    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+                    labels = kmeans.fit_predict(X)
 
-                silhouette = silhouette_score(X, labels)
+                    silhouette = silhouette_score(X, labels)
 
                 if silhouette > best_silhouette:
                     best_silhouette = silhouette
@@ -869,6 +1049,26 @@ class MultiAxisClusteringEngine:
         return best_k, best_silhouette
 
 
+    def _fit_kmeans(
+        self,
+        X: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fit KMeans on the configured backend.
+
+        Returns (labels, cluster_centers) as host NumPy arrays.
+        """
+        if self.backend == "cuml":
+            kmeans = cuKMeans(n_clusters=k, random_state=42, n_init=10)
+            labels = kmeans.fit_predict(cp.asarray(X, dtype=cp.float32))
+            return cp.asnumpy(labels), cp.asnumpy(kmeans.cluster_centers_).astype(np.float64)
+
+        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+        labels = kmeans.fit_predict(X)
+        return labels, kmeans.cluster_centers_
+
+
     async def _interpret_cluster(
         self,
         axis_name: str,
@@ -1056,8 +1256,9 @@ class MultiAxisClusteringEngine:
 
     def _calculate_fuzzy_membership(
         self,
-        customer_features: Dict[str, float],
-        segments: List[DiscoveredSegment]
+        customer_features: Union[Dict[str, float], Tuple[Sequence[str], np.ndarray]],
+        segments: List[DiscoveredSegment],
+        top_k: Optional[int] = None
     ) -> Dict[str, float]:
         """
         Calculate fuzzy membership for customer across all segments in axis.
@@ -1070,39 +1271,53 @@ class MultiAxisClusteringEngine:
         - Far from cluster center = low membership
         - Memberships sum to 1.0
 
+        Args:
+            customer_features: {feature_name: value} dict, or a
+                (feature_names, values) tuple with values as a 1-D array
+            segments: Segments for one axis
+            top_k: Only return the k strongest segments, renormalized to sum
+                to 1.0 among themselves (default: None, all segments)
+
         Returns:
             {segment_name: membership_strength}
         """
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+
         # Convert customer features to vector
         feature_names = segments[0].feature_names
-        customer_vector = np.array([customer_features.get(fname, 0) for fname in feature_names])
+        if isinstance(customer_features, tuple):
+            names, values = customer_features
+            if list(names) == feature_names:
+                # Always a copy: the vector is sanitized in place below
+                customer_vector = np.array(values, dtype=np.float64)
+            else:
+                customer_vector = self._reorder_feature_vec(names, values, feature_names)
+        else:
+            customer_vector = self._dict_to_feature_vec(customer_features, feature_names)
 
-        # Handle NaN/inf
-        customer_vector = np.nan_to_num(customer_vector, nan=0.0, posinf=1e10, neginf=-1e10)
+        # Handle NaN/inf (in place; customer_vector is always our own array)
+        np.nan_to_num(customer_vector, copy=False, nan=0.0, posinf=1e10, neginf=-1e10)
 
         # CRITICAL FIX: Use POPULATION scaler from training, not customer's own statistics
         # All segments in an axis share the same scaler params
-        scaler_params = segments[0].scaler_params
-        mean = np.array(scaler_params['mean'])
-        scale = np.array(scaler_params['scale'])
-
-        # Standardize using population statistics (same as training)
-        customer_vector_scaled = (customer_vector - mean) / scale
-
-        # Calculate distances to all cluster centers
-        distances = []
-        for segment in segments:
-            dist = np.linalg.norm(customer_vector_scaled - segment.cluster_center)
-            distances.append(dist)
-
-        # Convert distances to similarities (inverse)
-        # Use softmax-like approach for smooth membership
-        distances = np.array(distances)
-        similarities = np.exp(-distances)  # Exponential decay
-
-        # Normalize to sum to 1.0
-        total = np.sum(similarities)
-        memberships = similarities / total if total > 0 else np.ones(len(segments)) / len(segments)
+        centers, mean, scale = self._get_segment_arrays(segments)
+
+        # Standardize using population statistics (same as training), take
+        # distances to all centers, exp-decay and normalize to sum to 1.0
+        # (compiled with Numba or Cython when available)
+        kernel = _get_fuzzy_membership_kernel(*centers.shape)
+        memberships = kernel(centers, mean, scale, customer_vector)
+
+        if top_k is not None and top_k < len(segments):
+            # k strongest, kept in segment order
+            top = np.sort(np.argpartition(memberships, -top_k)[-top_k:])
+            weights = memberships[top]
+            weights = weights / weights.sum()
+            return {
+                segments[i].segment_name: float(w)
+                for i, w in zip(top.tolist(), weights.tolist())
+            }
 
         return {
             segments[i].segment_name: float(memberships[i])
@@ -1110,6 +1325,137 @@ class MultiAxisClusteringEngine:
         }
 
 
+    def _calculate_fuzzy_membership_batch(
+        self,
+        features_matrix: np.ndarray,
+        segments: List[DiscoveredSegment],
+        chunk_size: int = 4096
+    ) -> np.ndarray:
+        """
+        Calculate fuzzy membership for many customers at once.
+
+        Same math as _calculate_fuzzy_membership, broadcast over rows.
+
+        Args:
+            features_matrix: (n_customers, n_features) raw features, columns
+                ordered as segments[0].feature_names
+            segments: Segments for one axis
+            chunk_size: Rows per chunk, bounds the (rows, segments, features)
+                intermediate
+
+        Returns:
+            (n_customers, n_segments) memberships; each row sums to 1.0 and
+            columns follow the order of segments
+        """
+        X = np.nan_to_num(
+            np.asarray(features_matrix, dtype=np.float64),
+            nan=0.0, posinf=1e10, neginf=-1e10
+        )
+        centers, mean, scale = self._get_segment_arrays(segments)
+
+        memberships = np.empty((X.shape[0], len(segments)))
+
+        for start in range(0, X.shape[0], chunk_size):
+            X_scaled = (X[start:start + chunk_size] - mean) / scale
+
+            distances = np.sqrt(
+                ((X_scaled[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1)
+            )
+            similarities = np.exp(-distances)
+
+            # Normalize rows to sum to 1.0 (uniform where all underflow)
+            totals = similarities.sum(axis=1, keepdims=True)
+            memberships[start:start + chunk_size] = np.divide(
+                similarities, totals,
+                out=np.full_like(similarities, 1.0 / len(segments)),
+                where=totals > 0
+            )
+
+        return memberships
+
+
+    def _dict_to_feature_vec(
+        self,
+        features: Dict[str, float],
+        feature_names: List[str]
+    ) -> np.ndarray:
+        """
+        Convert a {feature_name: value} dict to a vector ordered as feature_names.
+
+        Uses an itemgetter built once per feature name list; features missing
+        from the dict fall back to per-name lookups with a default of 0.
+        """
+        key = tuple(feature_names)
+        getter = self._feature_getters.get(key)
+        if getter is None:
+            getter = self._feature_getters[key] = itemgetter(*key)
+
+        try:
+            values = getter(features)
+        except KeyError:
+            values = [features.get(fname, 0) for fname in feature_names]
+
+        # ndmin=1: itemgetter with a single name returns a scalar
+        return np.array(values, dtype=np.float64, ndmin=1)
+
+
+    def _reorder_feature_vec(
+        self,
+        names: Sequence[str],
+        values: np.ndarray,
+        feature_names: List[str]
+    ) -> np.ndarray:
+        """
+        Reorder a values array labelled by names into feature_names order.
+
+        The name -> column index map is built once per (names, feature_names)
+        pair; features absent from names are filled with 0.
+        """
+        key = (tuple(names), tuple(feature_names))
+        index = self._feature_index_cache.get(key)
+        if index is None:
+            name_to_idx = {name: i for i, name in enumerate(key[0])}
+            # Missing features point at the trailing 0 appended below
+            missing = len(key[0])
+            index = np.fromiter(
+                (name_to_idx.get(fname, missing) for fname in feature_names),
+                dtype=np.intp,
+                count=len(feature_names)
+            )
+            self._feature_index_cache[key] = index
+
+        padded = np.append(np.asarray(values, dtype=np.float64), 0.0)
+        return padded[index]
+
+
+    def _get_segment_arrays(
+        self,
+        segments: List[DiscoveredSegment]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get (centers, mean, scale) arrays for an axis's segment list.
+
+        Built once per segment list and cached by axis name, so repeated
+        membership calls against the same segments skip rebuilding arrays
+        from per-segment lists. The cached entry is only reused when it was
+        built from this exact list object.
+        """
+        axis_name = segments[0].axis_name
+        cached = self._segment_cache.get(axis_name)
+        if cached is not None and cached[0] is segments:
+            return cached[1]
+
+        scaler_params = segments[0].scaler_params
+        arrays = (
+            np.ascontiguousarray([s.cluster_center for s in segments], dtype=np.float64),
+            np.asarray(scaler_params['mean'], dtype=np.float64),
+            np.asarray(scaler_params['scale'], dtype=np.float64)
+        )
+
+        self._segment_cache[axis_name] = (segments, arrays)
+        return arrays
+
+
     def _generate_interpretation(
         self,
         axis_profiles: Dict[str, CustomerAxisProfile]
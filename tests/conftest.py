@@ -6,6 +6,9 @@ Shared fixtures for all tests:
 - Mock data generators
 - Test utilities
 
+Tests can run in parallel with pytest-xdist (pytest -n auto); each worker
+gets its own in-memory SQLite databases.
+
 Author: Quimbi Platform
 Date: October 14, 2025
 """
@@ -13,45 +16,95 @@ Date: October 14, 2025
 import pytest
 import pytest_asyncio
 import asyncio
+import hashlib
+import hmac
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import AsyncGenerator, Dict, List, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.pool import StaticPool
 import numpy as np
 
 # from backend.core.pii_tokenization import PIITokenizationService  # Not needed for security tests
 # from backend.api.auth import APIKeyManager  # Import conditionally
-from backend.core.multi_axis_clustering_engine import DiscoveredSegment
+from backend.segmentation.multi_axis_clustering_engine import DiscoveredSegment
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
-# Configure event loop for async tests
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
+# pytest-xdist worker id ("gw0", "gw1", ...), "main" when not distributed
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+
+# bcrypt cost factor for keys created by fixtures (library minimum by default)
+BCRYPT_TEST_ROUNDS = int(os.getenv("TEST_BCRYPT_ROUNDS", "4"))
+
+# Digest constructor for webhook signatures, bound once
+_SHA256 = hashlib.sha256
+
+# "sk_live_" + 48 key characters (56 total), compiled once at import
+_API_KEY_RE = re.compile(r"sk_live_.{48}", re.DOTALL)
 
 
 # Configure pytest-asyncio
 @pytest.fixture(scope="session")
 def event_loop_policy():
-    """Use the default event loop policy"""
+    """Use uvloop's event loop policy when installed, else the default"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.EventLoopPolicy()
     return asyncio.DefaultEventLoopPolicy()
 
 
+# Configure event loop for async tests
+@pytest.fixture(scope="session")
+def event_loop(event_loop_policy):
+    """Create event loop for async tests"""
+    loop = event_loop_policy.new_event_loop()
+    yield loop
+    loop.close()
+
+
 # Database fixtures
 
-@pytest_asyncio.fixture
-async def test_db_engine():
-    """Create test database engine (in-memory SQLite for speed)"""
+def _test_database_url(name: str) -> str:
+    """In-memory SQLite URL, named per xdist worker so workers never share state"""
+    return f"sqlite+aiosqlite:///file:{name}_{XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+
+
+def _create_test_engine(name: str):
+    """
+    Create an in-memory SQLite engine on a single static connection.
+
+    StaticPool skips per-session connection setup. The driver's implicit
+    transaction handling is disabled and BEGIN is emitted explicitly, so
+    SAVEPOINTs (used by db_session for per-test isolation) work on SQLite.
+    """
     engine = create_async_engine(
-        "sqlite+aiosqlite:///:memory:",
-        echo=False
+        _test_database_url(name),
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
     )
 
-    # Create tables once
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+async def _create_test_tables(engine):
+    """Create the tables used by the test suite on the given engine"""
     async with engine.begin() as conn:
         await conn.execute(text("""
             CREATE TABLE IF NOT EXISTS pii_token_vault (
@@ -99,6 +152,26 @@ async def test_db_engine():
             )
         """))
 
+
+@pytest_asyncio.fixture(scope="module")
+async def test_db_engine():
+    """Create test database engine (in-memory SQLite, shared per module)"""
+    engine = _create_test_engine("test")
+
+    # Create tables once
+    await _create_test_tables(engine)
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def session_db_engine():
+    """Create test database engine shared by session-scoped fixtures"""
+    engine = _create_test_engine("session")
+
+    await _create_test_tables(engine)
+
     yield engine
     await engine.dispose()
 
@@ -108,17 +181,23 @@ async def db_session(test_db_engine):
     """
     Provide clean database session for each test.
 
-    Automatically rolls back after each test.
+    The session runs inside an outer transaction on the module's engine;
+    commits in the test only release SAVEPOINTs, and everything is rolled
+    back after the test.
     """
-    async_session = async_sessionmaker(
-        test_db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
+    async with test_db_engine.connect() as conn:
+        trans = await conn.begin()
+
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint"
+        )
 
-    async with async_session() as session:
         yield session
-        await session.rollback()
+
+        await session.close()
+        await trans.rollback()
 
 
 # Service fixtures
@@ -133,7 +212,7 @@ def pii_service():
         pytest.skip("PII tokenization service not available")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key_manager():
     """Provide API key manager"""
     try:
@@ -143,73 +222,196 @@ def api_key_manager():
         pytest.skip("API key manager not available")
 
 
-@pytest.fixture
-def client():
-    """Provide FastAPI test client (for sync tests only)"""
+@pytest.fixture(scope="session")
+def app():
+    """Provide the FastAPI application (imported once per session)"""
+    try:
+        from backend.main import app as _app
+        return _app
+    except ImportError:
+        pytest.skip("FastAPI application not available")
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Provide FastAPI test client (for sync tests only, shared by the session)"""
     from fastapi.testclient import TestClient
-    from backend.main import app
 
     return TestClient(app)
 
 
-@pytest_asyncio.fixture
-async def async_client():
+@pytest.fixture
+def reset_limiter(app):
+    """
+    Clear the app's rate limit counters around a test.
+
+    The session-wide client shares one in-memory limiter, so tests that make
+    requests would otherwise count against each other's limits.
+    """
+    app.state.limiter.reset()
+    yield
+    app.state.limiter.reset()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(app):
     """Provide async FastAPI test client"""
-    from httpx import AsyncClient
-    from backend.main import app
+    from httpx import AsyncClient, ASGITransport
 
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
 
-@pytest_asyncio.fixture
-async def valid_api_key(api_key_manager, test_db_engine):
-    """Create and return a valid API key for testing"""
-    async_session = async_sessionmaker(
-        test_db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
+@contextmanager
+def fast_bcrypt():
+    """
+    Lower bcrypt cost to the library minimum while creating test keys.
 
-    async with async_session() as session:
+    Fixture keys only need to exist, not resist brute force, so there is
+    no reason to pay production-strength hashing for them.
+    """
+    import bcrypt
+
+    gensalt = bcrypt.gensalt
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            bcrypt,
+            "gensalt",
+            lambda rounds=BCRYPT_TEST_ROUNDS, prefix=b"2b": gensalt(BCRYPT_TEST_ROUNDS, prefix)
+        )
+        yield
+
+
+async def _create_test_api_key(api_key_manager, session: AsyncSession) -> str:
+    """Create a read/write API key through the given session and return it"""
+    with fast_bcrypt():
         plain_key, _ = await api_key_manager.create_api_key(
             session,
             name="Test API Key",
             scopes=["read", "write"],
             expires_days=365
         )
-        await session.commit()
-        return plain_key
+    await session.commit()
+    return plain_key
+
+
+@pytest_asyncio.fixture(scope="session")
+async def valid_api_key(api_key_manager, session_db_engine):
+    """Create and return a valid API key, shared across the test session"""
+    async_session = async_sessionmaker(
+        session_db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+    async with async_session() as session:
+        return await _create_test_api_key(api_key_manager, session)
+
+
+@pytest_asyncio.fixture
+async def fresh_api_key(api_key_manager, db_session):
+    """
+    Create and return a new API key (for tests that revoke or mutate it)
+
+    The key is created through db_session, so it lives inside the test's
+    transaction and is rolled back with everything else. Opening another
+    session on the engine would fight db_session for the single StaticPool
+    connection.
+    """
+    return await _create_test_api_key(api_key_manager, db_session)
+
+
+@pytest.fixture(scope="session")
+def prebuilt_key_and_hash(api_key_manager):
+    """One (plain_key, key_hash) pair shared by hash verification tests"""
+    api_key = api_key_manager.generate_api_key()
+
+    with fast_bcrypt():
+        key_hash = api_key_manager.hash_api_key(api_key)
+
+    return api_key, key_hash
+
+
+def _sha256_hex(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@pytest.fixture
+def fast_auth(monkeypatch, api_key_manager):
+    """
+    API key manager with bcrypt swapped for SHA-256 (this test only).
+
+    For tests that check create/validate/revoke control flow rather than
+    hashing; TestAPIKeyHashing keeps using real bcrypt.
+    """
+    monkeypatch.setattr(api_key_manager, "hash_api_key", _sha256_hex)
+    monkeypatch.setattr(
+        api_key_manager,
+        "verify_api_key",
+        lambda api_key, key_hash: hmac.compare_digest(_sha256_hex(api_key), key_hash)
+    )
+    return api_key_manager
+
+
+@pytest.fixture(scope="session")
+def make_sig():
+    """
+    Build a Gorgias-style "sha256=<hex>" signature header for (secret, payload)
+
+    Memoized for the session, so each (secret, payload) pair is signed once.
+    Uses the one-shot hmac.digest(), equivalent to hmac.new(...).hexdigest().
+    """
+    @lru_cache(maxsize=None)
+    def _make_sig(secret: str, payload: bytes) -> str:
+        digest = hmac.digest(secret.encode('utf-8'), payload, _SHA256)
+        return f"sha256={digest.hex()}"
+
+    return _make_sig
 
 
 # Mock data generators
 
+MOCK_EVENT_TYPES = (
+    'level_complete', 'item_purchase', 'combat_victory',
+    'quest_start', 'achievement_unlock'
+)
+
+
 @pytest.fixture
 def mock_player_events() -> List[Dict[str, Any]]:
-    """Generate mock player events for testing"""
+    """Generate mock player events for testing (seeded, deterministic)"""
+    n_events = 100
     base_time = datetime.utcnow() - timedelta(days=30)
 
-    events = []
-    for i in range(100):
-        events.append({
+    # Draw every random column in one call each
+    rng = np.random.default_rng(0)
+    event_types = rng.choice(MOCK_EVENT_TYPES, size=n_events).tolist()
+    levels = rng.integers(1, 50, size=n_events).tolist()
+    scores = rng.integers(100, 1000, size=n_events).tolist()
+
+    return [
+        {
             'player_id': 'test_player_001',
-            'event_type': np.random.choice([
-                'level_complete', 'item_purchase', 'combat_victory',
-                'quest_start', 'achievement_unlock'
-            ]),
+            'event_type': event_type,
             'timestamp': base_time + timedelta(hours=i),
             'properties': {
-                'level': np.random.randint(1, 50),
-                'score': np.random.randint(100, 1000)
+                'level': level,
+                'score': score
             }
-        })
-
-    return events
+        }
+        for i, (event_type, level, score) in enumerate(zip(event_types, levels, scores))
+    ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_segments() -> List[DiscoveredSegment]:
-    """Generate mock discovered segments for testing"""
+    """
+    Generate mock discovered segments for testing
+
+    Built once per session and shared; cluster centers are read-only so a
+    test that tries to modify them fails loudly instead of leaking state.
+    """
     segments = []
 
     # Create 3 mock segments for temporal_patterns axis
@@ -230,14 +432,61 @@ def mock_segments() -> List[DiscoveredSegment]:
                 'feature_names': ['weekend_ratio', 'session_consistency']
             },
             population_percentage=1.0 / 3,
-            player_count=100,
+            customer_count=100,
             interpretation=interpretation
         )
+        segment.cluster_center.setflags(write=False)
         segments.append(segment)
 
     return segments
 
 
+@pytest.fixture(scope="module")
+def segment_factory():
+    """
+    Build a list of DiscoveredSegment for one axis from a centers table.
+
+    Row i of centers becomes segment i's cluster_center (a view, not a
+    copy) and all segments share one scaler_params dict. Defaults: features
+    f1..fD, identity scaler, segment names segment_0..segment_{N-1}.
+    """
+    def make(
+        centers,
+        mean=None,
+        scale=None,
+        names=None,
+        feature_names=None,
+        axis_name: str = "test"
+    ) -> List[DiscoveredSegment]:
+        centers = np.asarray(centers, dtype=np.float64)
+        n_segments, n_features = centers.shape
+
+        feature_names = list(feature_names or (f"f{j + 1}" for j in range(n_features)))
+        names = names or [f"segment_{i}" for i in range(n_segments)]
+        scaler_params = {
+            "mean": list(mean) if mean is not None else [0.0] * n_features,
+            "scale": list(scale) if scale is not None else [1.0] * n_features,
+            "feature_names": feature_names
+        }
+
+        return [
+            DiscoveredSegment(
+                segment_id=f"seg{i}",
+                axis_name=axis_name,
+                segment_name=names[i],
+                cluster_center=centers[i],
+                feature_names=feature_names,
+                scaler_params=scaler_params,
+                population_percentage=1.0 / n_segments,
+                customer_count=100 // n_segments,
+                interpretation=names[i]
+            )
+            for i in range(n_segments)
+        ]
+
+    return make
+
+
 @pytest.fixture
 def mock_player_features() -> Dict[str, float]:
     """Generate mock player features"""
@@ -290,6 +539,9 @@ def assert_token_format_valid(token: str):
 
 def assert_api_key_format_valid(api_key: str):
     """Assert API key has correct format"""
+    if _API_KEY_RE.fullmatch(api_key):
+        return
+    # Slow path only on failure, for a precise message
     assert api_key.startswith("sk_live_"), f"API key should start with 'sk_live_', got {api_key}"
     assert len(api_key) == 56, f"API key should be 56 chars, got {len(api_key)}"
 
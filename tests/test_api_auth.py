@@ -13,8 +13,7 @@ Date: October 14, 2025
 """
 
 import pytest
-from backend.api.auth import APIKeyManager
-from tests.conftest import assert_api_key_format_valid
+from tests.conftest import assert_api_key_format_valid, fast_bcrypt
 
 
 class TestAPIKeyGeneration:
@@ -62,18 +61,16 @@ class TestAPIKeyHashing:
         assert len(key_hash) == 60, "Bcrypt hash should be 60 characters"
         assert key_hash.startswith("$2b$"), "Should be bcrypt hash"
 
-    def test_verify_correct_key(self, api_key_manager):
+    def test_verify_correct_key(self, api_key_manager, prebuilt_key_and_hash):
         """Test verification of correct key"""
-        api_key = api_key_manager.generate_api_key()
-        key_hash = api_key_manager.hash_api_key(api_key)
+        api_key, key_hash = prebuilt_key_and_hash
 
         assert api_key_manager.verify_api_key(api_key, key_hash), "Correct key should verify"
 
-    def test_verify_incorrect_key(self, api_key_manager):
+    def test_verify_incorrect_key(self, api_key_manager, prebuilt_key_and_hash):
         """Test verification rejects incorrect key"""
-        api_key = api_key_manager.generate_api_key()
+        _, key_hash = prebuilt_key_and_hash
         wrong_key = api_key_manager.generate_api_key()
-        key_hash = api_key_manager.hash_api_key(api_key)
 
         assert not api_key_manager.verify_api_key(wrong_key, key_hash), "Wrong key should fail"
 
@@ -81,8 +78,10 @@ class TestAPIKeyHashing:
         """Test same key produces different hashes (salt)"""
         api_key = api_key_manager.generate_api_key()
 
-        hash1 = api_key_manager.hash_api_key(api_key)
-        hash2 = api_key_manager.hash_api_key(api_key)
+        # Salting doesn't depend on cost factor
+        with fast_bcrypt():
+            hash1 = api_key_manager.hash_api_key(api_key)
+            hash2 = api_key_manager.hash_api_key(api_key)
 
         assert hash1 != hash2, "Same key should produce different hashes (random salt)"
 
@@ -95,9 +94,9 @@ class TestAPIKeyCreation:
     """Test API key creation and storage"""
 
     @pytest.mark.asyncio
-    async def test_create_api_key(self, api_key_manager, db_session):
+    async def test_create_api_key(self, fast_auth, db_session):
         """Test creating and storing API key"""
-        plain_key, key_info = await api_key_manager.create_api_key(
+        plain_key, key_info = await fast_auth.create_api_key(
             db_session,
             name="Test API Key",
             scopes=["read", "write"],
@@ -111,9 +110,9 @@ class TestAPIKeyCreation:
         assert "write" in key_info["scopes"]
 
     @pytest.mark.asyncio
-    async def test_validate_api_key(self, api_key_manager, db_session):
+    async def test_validate_api_key(self, fast_auth, db_session):
         """Test validating stored API key"""
-        plain_key, created_info = await api_key_manager.create_api_key(
+        plain_key, created_info = await fast_auth.create_api_key(
             db_session,
             name="Test Key",
             scopes=["read"],
@@ -122,25 +121,25 @@ class TestAPIKeyCreation:
         await db_session.commit()
 
         # Validate key
-        key_info = await api_key_manager.validate_api_key(db_session, plain_key)
+        key_info = await fast_auth.validate_api_key(db_session, plain_key)
 
         assert key_info is not None, "Valid key should validate"
         assert key_info["name"] == "Test Key"
         assert "read" in key_info["scopes"]
 
     @pytest.mark.asyncio
-    async def test_validate_invalid_key(self, api_key_manager, db_session):
+    async def test_validate_invalid_key(self, fast_auth, db_session):
         """Test validation rejects invalid key"""
-        fake_key = api_key_manager.generate_api_key()
+        fake_key = fast_auth.generate_api_key()
 
-        key_info = await api_key_manager.validate_api_key(db_session, fake_key)
+        key_info = await fast_auth.validate_api_key(db_session, fake_key)
 
         assert key_info is None, "Invalid key should return None"
 
     @pytest.mark.asyncio
-    async def test_scope_authorization(self, api_key_manager, db_session):
+    async def test_scope_authorization(self, fast_auth, db_session):
         """Test scope-based authorization"""
-        plain_key, _ = await api_key_manager.create_api_key(
+        plain_key, _ = await fast_auth.create_api_key(
             db_session,
             name="Read-Only Key",
             scopes=["read"],
@@ -149,11 +148,11 @@ class TestAPIKeyCreation:
         await db_session.commit()
 
         # Should validate with no required scopes
-        key_info = await api_key_manager.validate_api_key(db_session, plain_key)
+        key_info = await fast_auth.validate_api_key(db_session, plain_key)
         assert key_info is not None
 
         # Should validate with required "read" scope
-        key_info = await api_key_manager.validate_api_key(
+        key_info = await fast_auth.validate_api_key(
             db_session,
             plain_key,
             required_scopes=["read"]
@@ -161,7 +160,7 @@ class TestAPIKeyCreation:
         assert key_info is not None
 
         # Should fail with required "write" scope
-        key_info = await api_key_manager.validate_api_key(
+        key_info = await fast_auth.validate_api_key(
             db_session,
             plain_key,
             required_scopes=["write"]
@@ -169,9 +168,9 @@ class TestAPIKeyCreation:
         assert key_info is None, "Should fail scope check"
 
     @pytest.mark.asyncio
-    async def test_multiple_scopes(self, api_key_manager, db_session):
+    async def test_multiple_scopes(self, fast_auth, db_session):
         """Test key with multiple scopes"""
-        plain_key, _ = await api_key_manager.create_api_key(
+        plain_key, _ = await fast_auth.create_api_key(
             db_session,
             name="Full Access Key",
             scopes=["read", "write", "admin"],
@@ -181,7 +180,7 @@ class TestAPIKeyCreation:
 
         # Should validate with any single required scope
         for required_scope in ["read", "write", "admin"]:
-            key_info = await api_key_manager.validate_api_key(
+            key_info = await fast_auth.validate_api_key(
                 db_session,
                 plain_key,
                 required_scopes=[required_scope]
@@ -189,7 +188,7 @@ class TestAPIKeyCreation:
             assert key_info is not None, f"Should have {required_scope} scope"
 
         # Should validate with multiple required scopes
-        key_info = await api_key_manager.validate_api_key(
+        key_info = await fast_auth.validate_api_key(
             db_session,
             plain_key,
             required_scopes=["read", "write"]
@@ -201,9 +200,9 @@ class TestAPIKeyRevocation:
     """Test API key revocation"""
 
     @pytest.mark.asyncio
-    async def test_revoke_api_key(self, api_key_manager, db_session):
+    async def test_revoke_api_key(self, fast_auth, db_session):
         """Test revoking an API key"""
-        plain_key, key_info = await api_key_manager.create_api_key(
+        plain_key, key_info = await fast_auth.create_api_key(
             db_session,
             name="To Be Revoked",
             scopes=["read"],
@@ -214,7 +213,7 @@ class TestAPIKeyRevocation:
         key_id = key_info["id"]
 
         # Revoke
-        await api_key_manager.revoke_api_key(
+        await fast_auth.revoke_api_key(
             db_session,
             key_id,
             reason="security_incident"
@@ -222,7 +221,7 @@ class TestAPIKeyRevocation:
         await db_session.commit()
 
         # Should no longer validate
-        validated = await api_key_manager.validate_api_key(db_session, plain_key)
+        validated = await fast_auth.validate_api_key(db_session, plain_key)
         assert validated is None, "Revoked key should not validate"
 
 
@@ -230,10 +229,10 @@ class TestAPIKeyExpiration:
     """Test API key expiration"""
 
     @pytest.mark.asyncio
-    async def test_expired_key_not_validated(self, api_key_manager, db_session):
+    async def test_expired_key_not_validated(self, fast_auth, db_session):
         """Test expired key is not validated"""
         # Create key with 0 days expiration (already expired)
-        plain_key, _ = await api_key_manager.create_api_key(
+        plain_key, _ = await fast_auth.create_api_key(
             db_session,
             name="Expired Key",
             scopes=["read"],
@@ -242,7 +241,7 @@ class TestAPIKeyExpiration:
         await db_session.commit()
 
         # Should not validate (expired)
-        key_info = await api_key_manager.validate_api_key(db_session, plain_key)
+        key_info = await fast_auth.validate_api_key(db_session, plain_key)
 
         # Note: Actual expiration check depends on database NOW() function
         # This test may pass or fail depending on timing
@@ -253,9 +252,9 @@ class TestAPIKeyUsageTracking:
     """Test usage tracking for API keys"""
 
     @pytest.mark.asyncio
-    async def test_usage_count_increments(self, api_key_manager, db_session):
+    async def test_usage_count_increments(self, fast_auth, db_session):
         """Test usage count increments on validation"""
-        plain_key, _ = await api_key_manager.create_api_key(
+        plain_key, _ = await fast_auth.create_api_key(
             db_session,
             name="Usage Tracking Test",
             scopes=["read"],
@@ -263,10 +262,10 @@ class TestAPIKeyUsageTracking:
         )
         await db_session.commit()
 
-        # Validate multiple times
+        # Validate multiple times, committing the usage updates once
         for _ in range(3):
-            await api_key_manager.validate_api_key(db_session, plain_key)
-            await db_session.commit()
+            await fast_auth.validate_api_key(db_session, plain_key)
+        await db_session.commit()
 
         # Usage count should have incremented
         # (Would need to query database to verify)
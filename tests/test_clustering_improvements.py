@@ -0,0 +1,145 @@
+"""
+Unit Tests for Improved Clustering
+
+Tests preprocess_features and find_optimal_k_with_balance:
+- Exhaustive sweep picks the passing k with the best silhouette
+- Early stopping returns the first passing k
+- Early stopping stops past the silhouette knee
+- Opt-in float32 preprocessing: output dtype and stable cluster assignments
+
+Author: Quimbi Platform
+Date: October 18, 2026
+"""
+
+import pytest
+import numpy as np
+from backend.segmentation import clustering_improvements
+from backend.segmentation.clustering_improvements import (
+    ClusteringConfig,
+    ImprovedClusteringEngine
+)
+
+
+@pytest.fixture(scope="module")
+def six_blobs():
+    """600 points in six equal, well-separated blobs (balanced for k in 3..8)"""
+    rng = np.random.default_rng(0)
+    centers = np.array([[0, 0], [10, 0], [0, 10], [10, 10], [20, 0], [20, 10]], dtype=float)
+    return np.vstack([c + rng.normal(scale=0.5, size=(100, 2)) for c in centers])
+
+
+def _script_silhouette(monkeypatch, scores):
+    """Replace silhouette_score with per-k scores; returns the list of k scored"""
+    scored = []
+
+    def fake_silhouette(X, labels):
+        k = len(np.unique(labels))
+        scored.append(k)
+        return scores[k]
+
+    monkeypatch.setattr(clustering_improvements, "silhouette_score", fake_silhouette)
+    return scored
+
+
+class TestFindOptimalKWithBalance:
+    """Test the k search in both exhaustive and early-stop modes"""
+
+    def test_early_stop_off_by_default(self, monkeypatch):
+        """Test early stopping is opt-in, from code and from the environment"""
+        monkeypatch.delenv("CLUSTERING_EARLY_STOP", raising=False)
+
+        assert ClusteringConfig().early_stop_k_search is False
+        assert ClusteringConfig.from_env().early_stop_k_search is False
+
+    def test_exhaustive_picks_best_passing_silhouette(self, monkeypatch, six_blobs):
+        """Test the full sweep returns the passing k with the best silhouette"""
+        scored = _script_silhouette(
+            monkeypatch, {3: 0.50, 4: 0.70, 5: 0.60, 6: 0.40, 7: 0.45, 8: 0.42}
+        )
+        engine = ImprovedClusteringEngine(ClusteringConfig(min_k=3, max_k=8))
+
+        k, silhouette, metrics = engine.find_optimal_k_with_balance(six_blobs, "test_axis")
+
+        assert (k, silhouette) == (4, 0.70)
+        assert metrics.passes_quality_check
+        assert scored == [3, 4, 5, 6, 7, 8]
+
+    def test_early_stop_returns_first_passing_k(self, monkeypatch, six_blobs):
+        """Test early stopping returns the smallest passing k, even if a later k scores higher"""
+        scored = _script_silhouette(
+            monkeypatch, {3: 0.50, 4: 0.70, 5: 0.60, 6: 0.40, 7: 0.45, 8: 0.42}
+        )
+        engine = ImprovedClusteringEngine(
+            ClusteringConfig(min_k=3, max_k=8, early_stop_k_search=True)
+        )
+
+        k, silhouette, metrics = engine.find_optimal_k_with_balance(six_blobs, "test_axis")
+
+        assert (k, silhouette) == (3, 0.50)
+        assert metrics.passes_quality_check
+        assert scored == [3]
+
+    @pytest.mark.parametrize("early_stop,expected_scored", [
+        (False, [3, 4, 5, 6, 7, 8]),
+        (True, [3, 4, 5, 6]),
+    ], ids=["exhaustive", "early_stop"])
+    def test_knee_stop(self, monkeypatch, six_blobs, early_stop, expected_scored):
+        """Test early stopping ends the sweep after two consecutive silhouette drops"""
+        # All below min_silhouette, so no k passes and only the knee can stop
+        scored = _script_silhouette(
+            monkeypatch, {3: 0.20, 4: 0.30, 5: 0.25, 6: 0.20, 7: 0.10, 8: 0.33}
+        )
+        engine = ImprovedClusteringEngine(
+            ClusteringConfig(min_k=3, max_k=8, early_stop_k_search=early_stop)
+        )
+
+        k, _, metrics = engine.find_optimal_k_with_balance(six_blobs, "test_axis")
+
+        assert scored == expected_scored
+        assert not metrics.passes_quality_check
+        assert k == 3
+
+
+class TestFloat32Preprocessing:
+    """Test the opt-in float32 feature cast"""
+
+    def test_float32_off_by_default(self, monkeypatch):
+        """Test the float32 cast is opt-in, from code and from the environment"""
+        monkeypatch.delenv("CLUSTERING_FLOAT32", raising=False)
+
+        assert ClusteringConfig().use_float32 is False
+        assert ClusteringConfig.from_env().use_float32 is False
+
+    @pytest.mark.parametrize("robust", [True, False], ids=["robust", "standard"])
+    @pytest.mark.parametrize("use_float32,expected_dtype", [
+        (False, np.float64),
+        (True, np.float32),
+    ], ids=["float64", "float32"])
+    def test_output_dtype(self, six_blobs, robust, use_float32, expected_dtype):
+        """Test preprocessed features keep float64 unless float32 is enabled"""
+        engine = ImprovedClusteringEngine(
+            ClusteringConfig(enable_robust_scaling=robust, use_float32=use_float32)
+        )
+
+        X_scaled, _ = engine.preprocess_features(six_blobs, "test_axis")
+
+        assert X_scaled.dtype == expected_dtype
+        assert X_scaled.flags.c_contiguous
+
+    def test_float32_keeps_cluster_assignments(self, six_blobs):
+        """Test float32 preprocessing gives the same scaler params (to float32 precision) and clusters"""
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import adjusted_rand_score
+
+        results = {}
+        for use_float32 in (False, True):
+            engine = ImprovedClusteringEngine(ClusteringConfig(use_float32=use_float32))
+            X_scaled, scaler_params = engine.preprocess_features(six_blobs, "test_axis")
+            labels = KMeans(n_clusters=6, random_state=42, n_init=10).fit_predict(X_scaled)
+            results[use_float32] = (scaler_params, labels)
+
+        (params64, labels64), (params32, labels32) = results[False], results[True]
+
+        np.testing.assert_allclose(params32['center'], params64['center'], rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(params32['scale'], params64['scale'], rtol=1e-5)
+        assert adjusted_rand_score(labels64, labels32) == 1.0
@@ -0,0 +1,135 @@
+"""
+Unit Tests for E-Commerce Fuzzy Membership
+
+Tests EcommerceClusteringEngine._calculate_fuzzy_membership:
+- Cached segment arrays match the per-segment reference for each scaler type
+- The cache is keyed by segment list and dropped when an axis is re-fit
+
+Author: Quimbi Platform
+Date: October 18, 2026
+"""
+
+import pytest
+import numpy as np
+from backend.segmentation.ecommerce_clustering_engine import (
+    EcommerceClusteringEngine,
+    DiscoveredSegment
+)
+from tests.conftest import assert_fuzzy_memberships_valid
+
+
+FEATURE_NAMES = ["order_frequency", "avg_order_value", "days_since_last_order"]
+
+SCALER_PARAMS = {
+    "standard": {"type": "standard", "mean": [2.0, 50.0, 30.0], "scale": [1.5, 20.0, 25.0]},
+    "robust": {"type": "robust", "center": [1.0, 40.0, 20.0], "scale": [2.0, 35.0, 40.0]},
+    # Older rows stored only center/scale, without a type
+    "center_only": {"center": [1.5, 45.0, 25.0], "scale": [1.0, 30.0, 30.0]},
+}
+
+CUSTOMERS = [
+    {"order_frequency": 3.0, "avg_order_value": 80.0, "days_since_last_order": 10.0},
+    {"order_frequency": 0.5, "avg_order_value": 20.0},  # Missing feature -> 0
+    {"order_frequency": float("nan"), "avg_order_value": float("inf"), "days_since_last_order": 5.0},
+]
+
+
+def _make_segments(scaler_params, centers, axis_name="purchase_frequency"):
+    """One DiscoveredSegment per row of centers, sharing scaler_params"""
+    return [
+        DiscoveredSegment(
+            segment_id=f"seg{i}",
+            axis_name=axis_name,
+            segment_name=f"segment_{i}",
+            cluster_center=np.asarray(center, dtype=np.float64),
+            feature_names=FEATURE_NAMES,
+            scaler_params=scaler_params,
+            population_percentage=1.0 / len(centers),
+            customer_count=100,
+            interpretation=f"segment_{i}"
+        )
+        for i, center in enumerate(centers)
+    ]
+
+
+def _reference_membership(customer_features, segments):
+    """Per-segment membership, as computed before segment arrays were cached"""
+    feature_names = segments[0].feature_names
+    customer_vector = np.array([customer_features.get(fname, 0) for fname in feature_names])
+    customer_vector = np.nan_to_num(customer_vector, nan=0.0, posinf=1e10, neginf=-1e10)
+
+    scaler_params = segments[0].scaler_params
+    if scaler_params.get('type', 'standard') == 'robust':
+        center = np.array(scaler_params['center'])
+    else:
+        center = np.array(scaler_params.get('mean', scaler_params.get('center', [])))
+    customer_vector_scaled = (customer_vector - center) / np.array(scaler_params['scale'])
+
+    distances = np.array([
+        np.linalg.norm(customer_vector_scaled - segment.cluster_center)
+        for segment in segments
+    ])
+    similarities = np.exp(-distances)
+
+    total = similarities.sum()
+    if total > 0:
+        memberships = similarities / total
+    else:
+        memberships = np.ones(len(segments)) / len(segments)
+
+    return {segment.segment_name: float(m) for segment, m in zip(segments, memberships)}
+
+
+@pytest.fixture
+def engine():
+    return EcommerceClusteringEngine(use_ai_naming=False)
+
+
+class TestEcommerceFuzzyMembership:
+    """Test cached segment arrays give the same memberships as the per-segment loop"""
+
+    @pytest.mark.parametrize("scaler_type", list(SCALER_PARAMS))
+    def test_matches_per_segment_reference(self, engine, scaler_type):
+        """Test memberships match the reference for each scaler type"""
+        centers = [[-1.0, 0.5, 0.0], [0.0, 0.0, 0.0], [1.0, -0.5, 1.0]]
+        segments = _make_segments(SCALER_PARAMS[scaler_type], centers)
+
+        for customer in CUSTOMERS:
+            memberships = engine._calculate_fuzzy_membership(customer, segments)
+            expected = _reference_membership(customer, segments)
+
+            assert_fuzzy_memberships_valid(memberships)
+            assert memberships.keys() == expected.keys()
+            for name in expected:
+                assert memberships[name] == pytest.approx(expected[name], rel=1e-12, abs=1e-300)
+
+    def test_new_segment_list_rebuilds_arrays(self, engine):
+        """Test a new segment list for the same axis is not served stale arrays"""
+        old = _make_segments(SCALER_PARAMS["standard"], [[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        new = _make_segments(SCALER_PARAMS["robust"], [[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0]])
+        customer = CUSTOMERS[0]
+
+        engine._calculate_fuzzy_membership(customer, old)
+        memberships = engine._calculate_fuzzy_membership(customer, new)
+
+        expected = _reference_membership(customer, new)
+        for name in expected:
+            assert memberships[name] == pytest.approx(expected[name], rel=1e-12)
+
+    @pytest.mark.asyncio
+    async def test_refit_drops_cached_arrays(self, engine):
+        """Test re-fitting an axis drops its cached arrays and keeps other axes"""
+        segments = _make_segments(SCALER_PARAMS["standard"], [[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        other = _make_segments(
+            SCALER_PARAMS["robust"], [[0.0, 1.0, 0.0], [0.0, -1.0, 0.0]], axis_name="price_sensitivity"
+        )
+
+        engine._calculate_fuzzy_membership(CUSTOMERS[0], segments)
+        engine._calculate_fuzzy_membership(CUSTOMERS[0], other)
+        assert "purchase_frequency" in engine._segment_cache
+
+        # No features for the axis: _cluster_axis returns before clustering
+        assert await engine._cluster_axis("purchase_frequency", {}, "test_store") == []
+
+        assert "purchase_frequency" not in engine._segment_cache
+        assert "price_sensitivity" in engine._segment_cache
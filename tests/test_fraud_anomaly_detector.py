@@ -0,0 +1,91 @@
+"""
+Unit Tests for Value Outlier Detection
+
+Tests precomputed lifetime-value thresholds:
+- Precomputed thresholds give the same outliers/VIPs as per-call percentiles
+- build_population_stats feeds analyze_customer_for_anomalies identically
+- Empty and small populations are skipped
+
+Author: Quimbi Platform
+Date: October 18, 2026
+"""
+
+import pytest
+import numpy as np
+from backend.segmentation.fraud_anomaly_detector import FraudAnomalyDetector
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return FraudAnomalyDetector()
+
+
+@pytest.fixture(scope="module")
+def population_values():
+    """1,000 lognormal lifetime values"""
+    return np.random.default_rng(0).lognormal(mean=5.0, sigma=1.0, size=1000)
+
+
+def _lifetime_values(detector, population_values):
+    """Customers below, at, between and above the VIP/outlier thresholds"""
+    vip, outlier = detector.compute_value_thresholds(population_values)
+    return [0.0, float(np.median(population_values)), vip, (vip + outlier) / 2,
+            outlier, outlier * 1.01, float(population_values.max()) * 2]
+
+
+class TestPrecomputedValueThresholds:
+    """Test precomputed thresholds match the per-call path"""
+
+    def test_thresholds_match_percentiles(self, detector, population_values):
+        """Test thresholds are the configured VIP/outlier percentiles"""
+        vip, outlier = detector.compute_value_thresholds(population_values)
+
+        assert vip == pytest.approx(np.percentile(population_values, detector.value_percentile_vip))
+        assert outlier == pytest.approx(np.percentile(population_values, detector.value_percentile_outlier))
+        assert vip <= outlier
+
+    def test_precomputed_thresholds_match_per_call(self, detector, population_values):
+        """Test outlier/VIP results are identical with and without precomputed thresholds"""
+        vip, outlier = detector.compute_value_thresholds(population_values)
+
+        flagged = 0
+        for i, lifetime_value in enumerate(_lifetime_values(detector, population_values)):
+            per_call = detector.detect_value_outliers(f"C{i}", lifetime_value, population_values)
+            precomputed = detector.detect_value_outliers(
+                f"C{i}", lifetime_value, population_values,
+                vip_threshold=vip, outlier_threshold=outlier
+            )
+
+            assert precomputed == per_call
+            flagged += per_call is not None
+
+        assert flagged == 3  # At, just above and far above the outlier threshold
+
+    def test_population_stats_match_raw_values(self, detector, population_values):
+        """Test analyze_customer_for_anomalies gives the same result from build_population_stats"""
+        raw_stats = {'all_values': population_values, 'velocity_mean': 0.0, 'velocity_std': 1.0}
+        built_stats = detector.build_population_stats(population_values)
+
+        assert 'vip_threshold' in built_stats and 'outlier_threshold' in built_stats
+
+        for i, lifetime_value in enumerate(_lifetime_values(detector, population_values)):
+            customer_data = {'lifetime_value': lifetime_value}
+
+            assert (
+                detector.analyze_customer_for_anomalies(f"C{i}", customer_data, built_stats)
+                == detector.analyze_customer_for_anomalies(f"C{i}", customer_data, raw_stats)
+            )
+
+    @pytest.mark.parametrize("size", [0, 99], ids=["empty", "below_minimum"])
+    def test_small_population_skipped(self, detector, size):
+        """Test populations under 100 get no thresholds and flag nothing"""
+        values = np.arange(size, dtype=float)
+
+        population_stats = detector.build_population_stats(values)
+
+        assert 'vip_threshold' not in population_stats
+        assert 'outlier_threshold' not in population_stats
+        assert detector.detect_value_outliers("C1", 1e9, values) is None
+        assert detector.analyze_customer_for_anomalies(
+            "C1", {'lifetime_value': 1e9}, population_stats
+        ) == ([], None)
@@ -13,9 +13,14 @@ Date: October 14, 2025
 
 import pytest
 import numpy as np
-from backend.core.multi_axis_clustering_engine import (
+from backend.segmentation import multi_axis_clustering_engine as engine_module
+from backend.segmentation.multi_axis_clustering_engine import (
     MultiAxisClusteringEngine,
-    DiscoveredSegment
+    DiscoveredSegment,
+    _fuzzy_membership_kernel,
+    _fuzzy_membership_numpy,
+    _fuzzy_membership_python,
+    _get_fuzzy_membership_kernel
 )
 from tests.conftest import assert_fuzzy_memberships_valid
 
@@ -39,43 +44,19 @@ class TestFuzzyMembershipCalculation:
 
         assert_fuzzy_memberships_valid(memberships)
 
-    def test_fuzzy_membership_uses_population_scaler(self):
+    def test_fuzzy_membership_uses_population_scaler(self, segment_factory):
         """Test uses population scaler, not player's own stats"""
         engine = MultiAxisClusteringEngine()
 
         # Create segments with known scaler params
-        segments = [
-            DiscoveredSegment(
-                segment_id="seg1",
-                axis_name="test",
-                segment_name="close_segment",
-                cluster_center=np.array([1.0, 1.0]),  # In scaled space
-                feature_names=["feat1", "feat2"],
-                scaler_params={
-                    "mean": [0.5, 0.5],  # Population mean
-                    "scale": [0.2, 0.2],  # Population std
-                    "feature_names": ["feat1", "feat2"]
-                },
-                population_percentage=0.5,
-                player_count=50,
-                interpretation="Close segment"
-            ),
-            DiscoveredSegment(
-                segment_id="seg2",
-                axis_name="test",
-                segment_name="far_segment",
-                cluster_center=np.array([-2.0, -2.0]),  # In scaled space
-                feature_names=["feat1", "feat2"],
-                scaler_params={
-                    "mean": [0.5, 0.5],
-                    "scale": [0.2, 0.2],
-                    "feature_names": ["feat1", "feat2"]
-                },
-                population_percentage=0.5,
-                player_count=50,
-                interpretation="Far segment"
-            )
-        ]
+        # (centers in scaled space; population mean 0.5, std 0.2)
+        segments = segment_factory(
+            [[1.0, 1.0], [-2.0, -2.0]],
+            mean=[0.5, 0.5],
+            scale=[0.2, 0.2],
+            names=["close_segment", "far_segment"],
+            feature_names=["feat1", "feat2"]
+        )
 
         # Player with features that scale to [1.0, 1.0]
         # (0.7 - 0.5) / 0.2 = 1.0
@@ -87,24 +68,12 @@ class TestFuzzyMembershipCalculation:
         assert memberships["close_segment"] > memberships["far_segment"]
         assert memberships["close_segment"] > 0.9, "Perfect match should have >0.9 membership"
 
-    def test_membership_strength_reflects_distance(self):
+    def test_membership_strength_reflects_distance(self, segment_factory):
         """Test membership strength decreases with distance"""
         engine = MultiAxisClusteringEngine()
 
-        # Three segments at different distances
-        segments = []
-        for i, distance in enumerate([0, 1, 2]):
-            segments.append(DiscoveredSegment(
-                segment_id=f"seg{i}",
-                axis_name="test",
-                segment_name=f"segment_{distance}",
-                cluster_center=np.array([float(distance), float(distance)]),
-                feature_names=["f1", "f2"],
-                scaler_params={"mean": [0.0, 0.0], "scale": [1.0, 1.0], "feature_names": ["f1", "f2"]},
-                population_percentage=1/3,
-                player_count=33,
-                interpretation=f"Segment at distance {distance}"
-            ))
+        # Three segments at distances 0, 1, 2 (segment_0..segment_2)
+        segments = segment_factory([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]])
 
         # Player at origin [0, 0]
         player_features = {"f1": 0.0, "f2": 0.0}
@@ -129,24 +98,11 @@ class TestFuzzyMembershipCalculation:
         for segment_name, strength in memberships.items():
             assert 0.0 <= strength <= 1.0, f"Membership for {segment_name} should be 0-1"
 
-    def test_extreme_outlier_still_gets_valid_memberships(self):
+    def test_extreme_outlier_still_gets_valid_memberships(self, segment_factory):
         """Test extreme outlier gets valid memberships"""
         engine = MultiAxisClusteringEngine()
 
-        segments = [
-            DiscoveredSegment(
-                segment_id=f"seg{i}",
-                axis_name="test",
-                segment_name=f"segment_{i}",
-                cluster_center=np.array([float(i), float(i)]),
-                feature_names=["f1", "f2"],
-                scaler_params={"mean": [0.0, 0.0], "scale": [1.0, 1.0], "feature_names": ["f1", "f2"]},
-                population_percentage=1/3,
-                player_count=33,
-                interpretation=f"Segment {i}"
-            )
-            for i in range(3)
-        ]
+        segments = segment_factory([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]])
 
         # Extreme outlier
         player_features = {"f1": 1000.0, "f2": 1000.0}
@@ -155,6 +111,178 @@ class TestFuzzyMembershipCalculation:
 
         assert_fuzzy_memberships_valid(memberships)
 
+    def test_segment_arrays_cached_per_segment_list(self, mock_segments):
+        """Test segment arrays are built once per segment list"""
+        engine = MultiAxisClusteringEngine()
+
+        first = engine._get_segment_arrays(mock_segments)
+        second = engine._get_segment_arrays(mock_segments)
+
+        assert first is second, "Same segment list should reuse cached arrays"
+        assert first[0].shape == (len(mock_segments), 2)
+
+        # A different list for the same axis is rebuilt, not served stale
+        rebuilt = engine._get_segment_arrays(list(mock_segments))
+        assert rebuilt is not first
+        np.testing.assert_array_equal(rebuilt[0], first[0])
+
+    def test_array_features_match_dict_features(self, mock_segments):
+        """Test (feature_names, array) input gives the same memberships as a dict"""
+        engine = MultiAxisClusteringEngine()
+
+        player_features = {'weekend_ratio': 0.7, 'session_consistency': 0.8}
+        feature_names = mock_segments[0].feature_names
+        values = np.array([player_features[f] for f in feature_names])
+
+        from_dict = engine._calculate_fuzzy_membership(player_features, mock_segments)
+        from_array = engine._calculate_fuzzy_membership((feature_names, values), mock_segments)
+
+        # Names in a different order are matched by name, not position
+        reordered = engine._calculate_fuzzy_membership(
+            (feature_names[::-1], values[::-1]), mock_segments
+        )
+
+        assert from_array == pytest.approx(from_dict)
+        assert reordered == pytest.approx(from_dict)
+
+        # Features missing from the names default to 0, as with a dict
+        partial = engine._calculate_fuzzy_membership(
+            ([feature_names[1]], values[1:]), mock_segments
+        )
+        assert partial == pytest.approx(engine._calculate_fuzzy_membership(
+            {feature_names[1]: values[1]}, mock_segments
+        ))
+
+    def test_top_k_keeps_strongest_segments(self, segment_factory):
+        """Test top_k returns only the k closest segments, renormalized"""
+        engine = MultiAxisClusteringEngine()
+
+        segments = segment_factory([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+        player_features = {"f1": 0.0, "f2": 0.0}
+
+        full = engine._calculate_fuzzy_membership(player_features, segments)
+        top2 = engine._calculate_fuzzy_membership(player_features, segments, top_k=2)
+
+        assert list(top2) == ["segment_0", "segment_1"]
+        assert_fuzzy_memberships_valid(top2)
+
+        # Relative strengths are unchanged by the renormalization
+        assert top2["segment_0"] / top2["segment_1"] == pytest.approx(
+            full["segment_0"] / full["segment_1"]
+        )
+
+        # k >= N is the same as no top_k
+        assert engine._calculate_fuzzy_membership(player_features, segments, top_k=10) == full
+
+        with pytest.raises(ValueError):
+            engine._calculate_fuzzy_membership(player_features, segments, top_k=0)
+
+    def test_kernel_matches_numpy_reference(self):
+        """Test compiled kernel (if Numba installed) matches NumPy path"""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(4, 3))
+        mean = rng.normal(size=3)
+        scale = rng.uniform(0.5, 2.0, size=3)
+        x = rng.normal(size=3)
+
+        np.testing.assert_allclose(
+            _fuzzy_membership_kernel(centers, mean, scale, x),
+            _fuzzy_membership_numpy(centers, mean, scale, x),
+            rtol=1e-9
+        )
+
+    @pytest.mark.parametrize("x0", [709.0, 712.5, 725.0, 740.0, 744.5])
+    def test_kernel_matches_numpy_reference_for_subnormal_similarities(self, x0):
+        """Test compiled kernel normalizes subnormal similarities like NumPy"""
+        # Scaled distances of ~710-745 give exp(-d) in the subnormal range,
+        # where flush-to-zero / reciprocal fast-math broke the normalization
+        centers = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]])
+        mean = np.zeros(2)
+        scale = np.ones(2)
+        x = np.array([x0, 0.0])
+
+        memberships = _fuzzy_membership_kernel(centers, mean, scale, x)
+
+        assert np.all(np.isfinite(memberships))
+        assert memberships.sum() == pytest.approx(1.0)
+        np.testing.assert_allclose(
+            memberships,
+            _fuzzy_membership_numpy(centers, mean, scale, x),
+            rtol=1e-9
+        )
+
+    @pytest.mark.parametrize("offset", [0.0, 1e10])
+    def test_python_kernel_matches_numpy_reference(self, offset):
+        """Test pure-Python small-axis kernel matches NumPy path"""
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(3, 2))
+        mean = rng.normal(size=2)
+        scale = rng.uniform(0.5, 2.0, size=2)
+        x = rng.normal(size=2) + offset
+
+        np.testing.assert_allclose(
+            _fuzzy_membership_python(centers, mean, scale, x),
+            _fuzzy_membership_numpy(centers, mean, scale, x),
+            rtol=1e-9
+        )
+
+    @pytest.mark.parametrize("n_segments,n_features", [(1, 1), (3, 2), (6, 5), (9, 8)])
+    def test_python_kernel_matches_compiled_kernel(self, n_segments, n_features):
+        """Test pure-Python and compiled (Numba/Cython if installed) kernels agree"""
+        rng = np.random.default_rng(n_segments * 100 + n_features)
+        centers = rng.normal(size=(n_segments, n_features))
+        mean = rng.normal(size=n_features)
+        scale = rng.uniform(0.5, 2.0, size=n_features)
+        x = rng.normal(size=n_features)
+
+        np.testing.assert_allclose(
+            _fuzzy_membership_python(centers, mean, scale, x),
+            _fuzzy_membership_kernel(centers, mean, scale, x),
+            rtol=1e-9
+        )
+
+    def test_kernel_selection_by_size(self, monkeypatch):
+        """Test the pure-Python kernel is only picked for small axes without Numba/Cython"""
+        assert _get_fuzzy_membership_kernel(3, 2) is (
+            _fuzzy_membership_kernel
+            if engine_module.NUMBA_AVAILABLE or engine_module.CYTHON_KERNEL_AVAILABLE
+            else _fuzzy_membership_python
+        )
+
+        monkeypatch.setattr(engine_module, "NUMBA_AVAILABLE", False)
+        monkeypatch.setattr(engine_module, "CYTHON_KERNEL_AVAILABLE", False)
+
+        assert _get_fuzzy_membership_kernel(4, 8) is _fuzzy_membership_python
+        assert _get_fuzzy_membership_kernel(3, 11) is _fuzzy_membership_kernel
+
+    def test_batch_membership_matches_single(self, mock_segments):
+        """Test batch membership rows are valid and match per-player calls"""
+        engine = MultiAxisClusteringEngine()
+
+        players = [
+            {'weekend_ratio': 0.7, 'session_consistency': 0.8},
+            {'weekend_ratio': 0.1, 'session_consistency': 0.2},
+            {'weekend_ratio': float('nan'), 'session_consistency': 0.5},
+        ]
+        feature_names = mock_segments[0].feature_names
+        features_matrix = np.array([[p[f] for f in feature_names] for p in players])
+
+        batch = engine._calculate_fuzzy_membership_batch(
+            features_matrix,
+            mock_segments,
+            chunk_size=2  # Exercise chunking
+        )
+
+        assert batch.shape == (len(players), len(mock_segments))
+
+        for row, player_features in zip(batch, players):
+            memberships = dict(zip((s.segment_name for s in mock_segments), row))
+            assert_fuzzy_memberships_valid(memberships)
+
+            single = engine._calculate_fuzzy_membership(player_features, mock_segments)
+            for name, strength in single.items():
+                assert abs(memberships[name] - strength) < 1e-9
+
 
 class TestScalerParameters:
     """Test scaler parameters are correctly stored and used"""
@@ -173,7 +301,7 @@ class TestScalerParameters:
                 "feature_names": ["f1", "f2"]
             },
             population_percentage=1.0,
-            player_count=100,
+            customer_count=100,
             interpretation="Test"
         )
 
@@ -203,7 +331,7 @@ class TestScalerParameters:
             feature_names=["f1", "f2"],
             scaler_params={"mean": [0.5, 0.5], "scale": [0.2, 0.2], "feature_names": ["f1", "f2"]},
             population_percentage=1.0,
-            player_count=100,
+            customer_count=100,
             interpretation="Segment 1"
         )
 
@@ -215,7 +343,7 @@ class TestScalerParameters:
             feature_names=["f1", "f2"],
             scaler_params={"mean": [1.0, 1.0], "scale": [0.5, 0.5], "feature_names": ["f1", "f2"]},  # Different scaler
             population_percentage=1.0,
-            player_count=100,
+            customer_count=100,
             interpretation="Segment 2"
         )
 
@@ -227,6 +355,88 @@ class TestScalerParameters:
         # This test demonstrates the importance of using the correct scaler
 
 
+class TestSegmentSizes:
+    """Test _cluster_axis sizes segments from the fitted labels"""
+
+    @pytest.mark.asyncio
+    async def test_customer_count_matches_label_counts(self, monkeypatch):
+        """Test each segment's customer_count is its label count, empty clusters included"""
+        k = 5
+        rng = np.random.default_rng(0)
+        customer_features = {
+            f"C{i}": {"test": {"f1": float(rng.normal()), "f2": float(rng.normal())}}
+            for i in range(120)
+        }
+        # Clusters 2 and 4 (the last, which bincount only sees via minlength)
+        # get no customers
+        labels = np.array([0] * 60 + [1] * 45 + [3] * 15)
+        centers = rng.normal(size=(k, 2))
+
+        engine = MultiAxisClusteringEngine(min_population=100, use_ai_naming=False)
+        monkeypatch.setattr(engine, "_find_optimal_k", lambda X, axis_name: (k, 0.9))
+        monkeypatch.setattr(engine, "_fit_kmeans", lambda X, n_clusters: (labels, centers))
+
+        names = iter(f"segment_{i}" for i in range(k))
+
+        async def interpret(axis_name, cluster_center, feature_names, population_X):
+            name = next(names)
+            return name, name
+
+        monkeypatch.setattr(engine, "_interpret_cluster", interpret)
+
+        segments = await engine._cluster_axis("test", customer_features, "test_store")
+
+        assert [s.customer_count for s in segments] == [
+            int(np.sum(labels == cluster_id)) for cluster_id in range(k)
+        ]
+        assert len(segments) == k
+        assert segments[2].customer_count == segments[4].customer_count == 0
+        assert segments[4].population_percentage == 0.0
+        assert sum(s.population_percentage for s in segments) == pytest.approx(1.0)
+
+
+class TestClusteringBackend:
+    """Test KMeans backend selection (cuML is opt-in)"""
+
+    def test_default_backend_is_sklearn(self):
+        """Test sklearn is used unless another backend is requested"""
+        assert MultiAxisClusteringEngine().backend == "sklearn"
+
+    def test_unknown_backend_raises_error(self):
+        """Test an unknown backend name is rejected"""
+        with pytest.raises(ValueError, match="Unknown clustering backend"):
+            MultiAxisClusteringEngine(backend="tensorflow")
+
+    def test_cuml_without_cuml_falls_back_to_sklearn(self, monkeypatch, caplog):
+        """Test requesting cuML without it installed warns and uses sklearn"""
+        monkeypatch.setattr(engine_module, "CUML_AVAILABLE", False)
+
+        with caplog.at_level("WARNING", logger=engine_module.__name__):
+            engine = MultiAxisClusteringEngine(backend="cuml")
+
+        assert engine.backend == "sklearn"
+        assert "cuML backend requested" in caplog.text
+
+    @pytest.mark.parametrize("cuml_installed", [False, True], ids=["no_cuml", "cuml_no_device"])
+    def test_auto_without_gpu_resolves_to_sklearn(self, monkeypatch, caplog, cuml_installed):
+        """Test "auto" picks sklearn when no CUDA device is present, without warning"""
+        class _NoDevices:
+            class cuda:
+                class runtime:
+                    @staticmethod
+                    def getDeviceCount():
+                        return 0
+
+        monkeypatch.setattr(engine_module, "CUML_AVAILABLE", cuml_installed)
+        monkeypatch.setattr(engine_module, "cp", _NoDevices, raising=False)
+
+        with caplog.at_level("WARNING", logger=engine_module.__name__):
+            engine = MultiAxisClusteringEngine(backend="auto")
+
+        assert engine.backend == "sklearn"
+        assert "cuML backend requested" not in caplog.text
+
+
 class TestConfigurableParameters:
     """Test clustering parameters are configurable"""
 
@@ -264,23 +474,11 @@ class TestConfigurableParameters:
 class TestEdgeCases:
     """Test edge cases in fuzzy membership"""
 
-    def test_nan_features_handled(self):
+    def test_nan_features_handled(self, segment_factory):
         """Test NaN features are handled gracefully"""
         engine = MultiAxisClusteringEngine()
 
-        segments = [
-            DiscoveredSegment(
-                segment_id="seg1",
-                axis_name="test",
-                segment_name="segment1",
-                cluster_center=np.array([0.0, 0.0]),
-                feature_names=["f1", "f2"],
-                scaler_params={"mean": [0.0, 0.0], "scale": [1.0, 1.0], "feature_names": ["f1", "f2"]},
-                population_percentage=1.0,
-                player_count=100,
-                interpretation="Segment"
-            )
-        ]
+        segments = segment_factory([[0.0, 0.0]])
 
         # Features with NaN
         player_features = {"f1": float('nan'), "f2": 0.5}
@@ -290,23 +488,11 @@ class TestEdgeCases:
         # Should handle NaN gracefully (convert to 0)
         assert all(not np.isnan(v) for v in memberships.values())
 
-    def test_inf_features_handled(self):
+    def test_inf_features_handled(self, segment_factory):
         """Test infinite features are handled"""
         engine = MultiAxisClusteringEngine()
 
-        segments = [
-            DiscoveredSegment(
-                segment_id="seg1",
-                axis_name="test",
-                segment_name="segment1",
-                cluster_center=np.array([0.0, 0.0]),
-                feature_names=["f1", "f2"],
-                scaler_params={"mean": [0.0, 0.0], "scale": [1.0, 1.0], "feature_names": ["f1", "f2"]},
-                population_percentage=1.0,
-                player_count=100,
-                interpretation="Segment"
-            )
-        ]
+        segments = segment_factory([[0.0, 0.0]])
 
         # Features with infinity
         player_features = {"f1": float('inf'), "f2": 0.5}
@@ -316,23 +502,11 @@ class TestEdgeCases:
         # Should handle inf gracefully
         assert all(not np.isinf(v) for v in memberships.values())
 
-    def test_missing_feature_defaults_to_zero(self):
+    def test_missing_feature_defaults_to_zero(self, segment_factory):
         """Test missing features default to zero"""
         engine = MultiAxisClusteringEngine()
 
-        segments = [
-            DiscoveredSegment(
-                segment_id="seg1",
-                axis_name="test",
-                segment_name="segment1",
-                cluster_center=np.array([0.0, 0.0]),
-                feature_names=["f1", "f2"],
-                scaler_params={"mean": [0.0, 0.0], "scale": [1.0, 1.0], "feature_names": ["f1", "f2"]},
-                population_percentage=1.0,
-                player_count=100,
-                interpretation="Segment"
-            )
-        ]
+        segments = segment_factory([[0.0, 0.0]])
 
         # Missing f2 feature
         player_features = {"f1": 0.5}
@@ -8,353 +8,381 @@ Tests for Card 1 (Security Vulnerabilities) and Card 2 (Rate Limiting):
 - Gorgias webhook signature validation
 - Rate limiting per endpoint
 
+Tests are plain functions tagged per area (api_key, cors, admin_key, webhook,
+rate_limit, integration), e.g. pytest -m webhook runs just that slice.
+Tests that load backend.main are also tagged needs_app; the app is only
+imported through the app/client fixtures, so pytest -m "not needs_app" is
+a fast unit-only lane that never builds the FastAPI app.
+
+Safe under pytest-xdist: environment changes go through monkeypatch and no
+database is shared. Run with pytest -n auto --dist=loadscope so each module
+stays on one worker and module fixtures (gorgias_assistant,
+app_routes_by_path) are built once; files then run in parallel.
+
 Author: Quimbi Platform
 Date: October 27, 2025
 """
 
 import pytest
-import os
 import hmac
 import hashlib
+from typing import Optional
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import HTTPException, status
 from fastapi.testclient import TestClient
 
+from backend.core import security
+from backend.core.security import (
+    _COMMON_WEAK_KEYS,
+    check_required_secrets,
+    parse_allowed_origins,
+    validate_admin_key
+)
+
+
+# API key authentication is enforced (Card 1.1)
+
+@pytest.mark.api_key
+@pytest.mark.needs_app
+@pytest.mark.usefixtures("reset_limiter")
+def test_api_key_required_for_mcp_query(client):
+    """Test /api/mcp/query requires API key"""
+    response = client.post(
+        "/api/mcp/query",
+        json={
+            "tool_name": "get_customer_profile",
+            "parameters": {"customer_id": "12345"}
+        }
+    )
+
+    # Should return 401 Unauthorized (no API key provided)
+    assert response.status_code == 401
+    assert "missing api key" in response.json()["detail"].lower()
+
+
+@pytest.mark.api_key
+@pytest.mark.needs_app
+@pytest.mark.usefixtures("reset_limiter")
+def test_api_key_accepted_when_valid(client, valid_api_key):
+    """Test valid API key is accepted"""
+    response = client.post(
+        "/api/mcp/query",
+        json={
+            "tool_name": "get_customer_profile",
+            "parameters": {"customer_id": "12345"}
+        },
+        headers={"X-API-Key": valid_api_key}
+    )
+
+    # Should succeed (200 or 422/404/500 if validation/not found, but not auth error)
+    assert response.status_code in [200, 422, 404, 500]
+    # Should NOT be authentication error
+    if response.status_code in [401, 403]:
+        pytest.fail(f"Should not return auth error {response.status_code}: {response.json()}")
+
+
+def _set_env(monkeypatch, name: str, value: Optional[str]):
+    """Set an environment variable for one test, or unset it if value is None"""
+    if value is None:
+        monkeypatch.delenv(name, raising=False)
+    else:
+        monkeypatch.setenv(name, value)
+
+
+# (ALLOWED_ORIGINS, RAILWAY_ENVIRONMENT, expect error, origins that must be allowed)
+CORS_CASES = [
+    pytest.param("*", "production", True, [], id="wildcard_rejected_in_production"),
+    pytest.param(
+        "https://example.com,https://www.example.com", "production", False,
+        ["https://example.com", "https://www.example.com"],
+        id="specific_origins_allowed_in_production"
+    ),
+    pytest.param(
+        None, None, False, ["http://localhost:3000", "http://localhost:8080"],
+        id="development_defaults_used"
+    ),
+]
+
+
+# CORS is properly configured (Card 1.2)
+
+@pytest.mark.cors
+@pytest.mark.parametrize("allowed_origins_env,railway_env,expect_error,must_contain", CORS_CASES)
+def test_cors_policy(allowed_origins_env, railway_env, expect_error, must_contain):
+    """Test wildcard origins are rejected in production and lists are parsed"""
+    if expect_error:
+        with pytest.raises(ValueError, match="Wildcard CORS"):
+            parse_allowed_origins(allowed_origins_env, railway_env)
+        return
+
+    allowed_origins = parse_allowed_origins(allowed_origins_env, railway_env)
+
+    for origin in must_contain:
+        assert origin in allowed_origins
+    assert "*" not in allowed_origins
+
+
+# Admin key validation at startup (Card 1.3)
+
+@pytest.mark.admin_key
+@pytest.mark.parametrize("admin_key", [None, ""], ids=["unset", "empty"])
+def test_missing_admin_key_raises_error(monkeypatch, admin_key):
+    """Test unset or empty ADMIN_KEY fails the required-secrets check"""
+    _set_env(monkeypatch, "ADMIN_KEY", admin_key)
+
+    with pytest.raises(RuntimeError, match="Missing required secrets: ADMIN_KEY"):
+        check_required_secrets()
+
+
+@pytest.mark.admin_key
+def test_required_secrets_present_accepted(monkeypatch):
+    """Test the required-secrets check passes once ADMIN_KEY is set"""
+    monkeypatch.setenv("ADMIN_KEY", "7f9a3b2e1d4c8f6a5b9e2d1c4f8a3b7e")
+
+    # Should not raise
+    check_required_secrets()
+
+
+# (ADMIN_KEY, expected error); the length check runs first, so short common
+# passwords are rejected for length
+WEAK_ADMIN_KEY_CASES = [
+    ("weak", "at least 16 characters"),
+    ("admin", "at least 16 characters"),
+    ("password", "at least 16 characters"),
+    ("changeme123", "at least 16 characters"),
+    ("test", "at least 16 characters"),
+    ("secret", "at least 16 characters"),
+    ("15_chars_long__", "at least 16 characters"),
+]
+
+
+@pytest.mark.admin_key
+@pytest.mark.parametrize("admin_key,expected_regex", WEAK_ADMIN_KEY_CASES)
+def test_weak_admin_key_raises_error(admin_key, expected_regex):
+    """Test each weak ADMIN_KEY is rejected with its specific error"""
+    with pytest.raises(RuntimeError, match=expected_regex):
+        validate_admin_key(admin_key)
+
+
+@pytest.mark.admin_key
+def test_common_admin_key_raises_error(monkeypatch):
+    """Test a long enough but common ADMIN_KEY is rejected, case-insensitively"""
+    common_key = "correcthorsebatterystaple"
+    monkeypatch.setattr(security, "_COMMON_WEAK_KEYS", _COMMON_WEAK_KEYS | {common_key})
+
+    with pytest.raises(RuntimeError, match="common password"):
+        validate_admin_key(common_key.upper())
 
-class TestAPIKeyEnforcement:
-    """Test API key authentication is enforced (Card 1.1)"""
 
-    def test_api_key_required_for_mcp_query(self, client):
-        """Test /api/mcp/query requires API key"""
-        response = client.post(
-            "/api/mcp/query",
-            json={
-                "tool_name": "get_customer_profile",
-                "parameters": {"customer_id": "12345"}
-            }
-        )
+@pytest.mark.admin_key
+def test_strong_admin_key_accepted():
+    """Test strong ADMIN_KEY is accepted"""
+    strong_key = "7f9a3b2e1d4c8f6a5b9e2d1c4f8a3b7e"  # 32 char hex
+    assert strong_key.lower() not in _COMMON_WEAK_KEYS
+
+    # Should not raise
+    validate_admin_key(strong_key)
+
+
+WEBHOOK_SECRET = "test_webhook_secret_key_12345"
+WEBHOOK_PAYLOAD = b'{"id": 123, "customer": {"name": "Test"}}'
+
+
+# Stands in for the correct signature of WEBHOOK_PAYLOAD (built by make_sig)
+VALID_SIGNATURE = object()
+
+# (case id, GORGIAS_WEBHOOK_SECRET or None if unset, signature header, expected)
+WEBHOOK_SIGNATURE_CASES = [
+    ("valid", WEBHOOK_SECRET, VALID_SIGNATURE, True),
+    ("invalid", WEBHOOK_SECRET, "sha256=invalid_signature_12345", False),
+    ("missing_header", WEBHOOK_SECRET, None, False),
+    ("missing_secret", None, "sha256=somesignature", False),
+    ("wrong_algorithm", WEBHOOK_SECRET, "md5=somehash", False),
+]
+
+
+@pytest.fixture(scope="session")
+def gorgias_assistant_cls():
+    """
+    GorgiasAIAssistant class, imported on first use
+
+    Keeps the anthropic SDK import chain out of collection and out of the
+    first webhook test's reported duration.
+    """
+    from integrations.gorgias_ai_assistant import GorgiasAIAssistant
+    return GorgiasAIAssistant
 
-        # Should return 401 Unauthorized (no API key provided)
-        assert response.status_code == 401
-        assert "missing api key" in response.json()["detail"].lower()
-
-    def test_api_key_accepted_when_valid(self, client, valid_api_key):
-        """Test valid API key is accepted"""
-        response = client.post(
-            "/api/mcp/query",
-            json={
-                "tool_name": "get_customer_profile",
-                "parameters": {"customer_id": "12345"}
-            },
-            headers={"X-API-Key": valid_api_key}
-        )
 
-        # Should succeed (200 or 422/404/500 if validation/not found, but not auth error)
-        assert response.status_code in [200, 422, 404, 500]
-        # Should NOT be authentication error
-        if response.status_code in [401, 403]:
-            pytest.fail(f"Should not return auth error {response.status_code}: {response.json()}")
-
-
-class TestCORSConfiguration:
-    """Test CORS is properly configured (Card 1.2)"""
-
-    def test_wildcard_cors_rejected_in_production(self):
-        """Test wildcard CORS is rejected in production"""
-        with patch.dict(os.environ, {
-            "ALLOWED_ORIGINS": "*",
-            "RAILWAY_ENVIRONMENT": "production"
-        }):
-            # Should raise ValueError on import
-            with pytest.raises(ValueError, match="Wildcard CORS"):
-                # Would need to reload module to test this
-                # For now, test the logic
-                allowed_origins = ["*"]
-                if os.getenv("RAILWAY_ENVIRONMENT") == "production" and "*" in allowed_origins:
-                    raise ValueError("Wildcard CORS origins not allowed in production")
-
-    def test_specific_origins_allowed_in_production(self):
-        """Test specific origins are allowed in production"""
-        with patch.dict(os.environ, {
-            "ALLOWED_ORIGINS": "https://example.com,https://www.example.com",
-            "RAILWAY_ENVIRONMENT": "production"
-        }):
-            allowed_origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
-
-            # Should not raise
-            if os.getenv("RAILWAY_ENVIRONMENT") == "production" and "*" in allowed_origins:
-                raise ValueError("Should not raise")
-
-            assert "https://example.com" in allowed_origins
-            assert "*" not in allowed_origins
-
-    def test_development_defaults_used(self):
-        """Test development defaults are used when no env var"""
-        with patch.dict(os.environ, {}, clear=True):
-            allowed_origins = os.getenv(
-                "ALLOWED_ORIGINS",
-                "http://localhost:3000,http://localhost:8080"
-            ).split(",")
-
-            assert "http://localhost:3000" in allowed_origins
-            assert "http://localhost:8080" in allowed_origins
-
-
-class TestAdminKeyValidation:
-    """Test admin key validation at startup (Card 1.3)"""
-
-    def test_missing_admin_key_raises_error(self):
-        """Test missing ADMIN_KEY raises error"""
-        with patch.dict(os.environ, {}, clear=True):
-            required_secrets = ["ADMIN_KEY"]
-            missing_secrets = [s for s in required_secrets if not os.getenv(s)]
-
-            if missing_secrets:
-                with pytest.raises(RuntimeError, match="Missing required secrets"):
-                    raise RuntimeError(f"Missing required secrets: {', '.join(missing_secrets)}")
-
-    def test_weak_admin_key_raises_error(self):
-        """Test weak ADMIN_KEY raises error"""
-        weak_keys = ["weak", "admin", "password", "changeme123", "test", "secret"]
-
-        for weak_key in weak_keys:
-            with patch.dict(os.environ, {"ADMIN_KEY": weak_key}):
-                admin_key = os.getenv("ADMIN_KEY")
-
-                # Test length check
-                if len(admin_key) < 16:
-                    with pytest.raises(RuntimeError, match="at least 16 characters"):
-                        raise RuntimeError("ADMIN_KEY must be at least 16 characters")
-
-                # Test common password check
-                if admin_key.lower() in ["changeme123", "admin", "password", "test", "secret"]:
-                    with pytest.raises(RuntimeError, match="common password"):
-                        raise RuntimeError("ADMIN_KEY must not be a common password")
-
-    def test_strong_admin_key_accepted(self):
-        """Test strong ADMIN_KEY is accepted"""
-        strong_key = "7f9a3b2e1d4c8f6a5b9e2d1c4f8a3b7e"  # 32 char hex
-
-        with patch.dict(os.environ, {"ADMIN_KEY": strong_key}):
-            admin_key = os.getenv("ADMIN_KEY")
-
-            # Should not raise
-            if len(admin_key) < 16:
-                raise RuntimeError("Should not raise for length")
-
-            if admin_key.lower() in ["changeme123", "admin", "password", "test", "secret"]:
-                raise RuntimeError("Should not raise for common password")
-
-            assert len(admin_key) >= 16
-
-
-class TestGorgiasWebhookSignature:
-    """Test Gorgias webhook signature validation (Card 1.4)"""
-
-    def test_validate_webhook_signature_valid(self):
-        """Test valid webhook signature is accepted"""
-        webhook_secret = "test_webhook_secret_key_12345"
-        payload = b'{"id": 123, "customer": {"name": "Test"}}'
-
-        # Generate valid signature
-        expected_signature = hmac.new(
-            key=webhook_secret.encode('utf-8'),
-            msg=payload,
-            digestmod=hashlib.sha256
-        ).hexdigest()
-
-        signature_header = f"sha256={expected_signature}"
-
-        # Mock the validation method
-        from integrations.gorgias_ai_assistant import GorgiasAIAssistant
-
-        with patch.dict(os.environ, {"GORGIAS_WEBHOOK_SECRET": webhook_secret}):
-            with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
-                assistant = GorgiasAIAssistant(
-                    gorgias_domain="test.gorgias.com",
-                    gorgias_username="test@example.com",
-                    gorgias_api_key="test_key",
-                    analytics_api_url="http://localhost:8000"
-                )
-                is_valid = assistant.validate_webhook_signature(payload, signature_header)
-
-                assert is_valid, "Valid signature should be accepted"
-
-    def test_validate_webhook_signature_invalid(self):
-        """Test invalid webhook signature is rejected"""
-        webhook_secret = "test_webhook_secret_key_12345"
-        payload = b'{"id": 123, "customer": {"name": "Test"}}'
-
-        # Wrong signature
-        signature_header = "sha256=invalid_signature_12345"
-
-        from integrations.gorgias_ai_assistant import GorgiasAIAssistant
-
-        with patch.dict(os.environ, {"GORGIAS_WEBHOOK_SECRET": webhook_secret}):
-            with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
-                assistant = GorgiasAIAssistant(
-                    gorgias_domain="test.gorgias.com",
-                    gorgias_username="test@example.com",
-                    gorgias_api_key="test_key",
-                    analytics_api_url="http://localhost:8000"
-                )
-                is_valid = assistant.validate_webhook_signature(payload, signature_header)
-
-                assert not is_valid, "Invalid signature should be rejected"
-
-    def test_validate_webhook_signature_missing_header(self):
-        """Test missing signature header is rejected"""
-        webhook_secret = "test_webhook_secret_key_12345"
-        payload = b'{"id": 123}'
-
-        from integrations.gorgias_ai_assistant import GorgiasAIAssistant
-
-        with patch.dict(os.environ, {"GORGIAS_WEBHOOK_SECRET": webhook_secret}):
-            with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
-                assistant = GorgiasAIAssistant(
-                    gorgias_domain="test.gorgias.com",
-                    gorgias_username="test@example.com",
-                    gorgias_api_key="test_key",
-                    analytics_api_url="http://localhost:8000"
-                )
-                is_valid = assistant.validate_webhook_signature(payload, None)
-
-                assert not is_valid, "Missing signature should be rejected"
-
-    def test_validate_webhook_signature_missing_secret(self):
-        """Test missing GORGIAS_WEBHOOK_SECRET is rejected"""
-        payload = b'{"id": 123}'
-        signature_header = "sha256=somesignature"
-
-        from integrations.gorgias_ai_assistant import GorgiasAIAssistant
-
-        with patch.dict(os.environ, {}, clear=True):
-            with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
-                assistant = GorgiasAIAssistant(
-                    gorgias_domain="test.gorgias.com",
-                    gorgias_username="test@example.com",
-                    gorgias_api_key="test_key",
-                    analytics_api_url="http://localhost:8000"
-                )
-                is_valid = assistant.validate_webhook_signature(payload, signature_header)
-
-                assert not is_valid, "Missing secret should be rejected"
-
-    def test_validate_webhook_signature_wrong_algorithm(self):
-        """Test wrong algorithm in signature is rejected"""
-        webhook_secret = "test_webhook_secret_key_12345"
-        payload = b'{"id": 123}'
-
-        # Use md5 instead of sha256
-        signature_header = "md5=somehash"
-
-        from integrations.gorgias_ai_assistant import GorgiasAIAssistant
-
-        with patch.dict(os.environ, {"GORGIAS_WEBHOOK_SECRET": webhook_secret}):
-            with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
-                assistant = GorgiasAIAssistant(
-                    gorgias_domain="test.gorgias.com",
-                    gorgias_username="test@example.com",
-                    gorgias_api_key="test_key",
-                    analytics_api_url="http://localhost:8000"
-                )
-                is_valid = assistant.validate_webhook_signature(payload, signature_header)
-
-                assert not is_valid, "Wrong algorithm should be rejected"
-
-
-class TestRateLimiting:
-    """Test rate limiting is enforced (Card 2)"""
-
-    @pytest.mark.skip(reason="Requires slowapi integration test - would need to make 100+ requests")
-    def test_rate_limit_enforced_on_health(self, client):
-        """Test rate limit is enforced on /health endpoint (200/hour)"""
-        # Make 201 requests
-        responses = []
-        for i in range(201):
-            response = client.get("/health")
-            responses.append(response.status_code)
-
-        # First 200 should succeed
-        assert all(r in [200, 503] for r in responses[:200])
-
-        # 201st should be rate limited
-        assert responses[200] == 429
-
-    def test_rate_limit_configuration_exists(self):
-        """Test rate limiter is configured in app"""
-        # This tests that the rate limiter initialization exists
-        from backend.main import app
-
-        # Check limiter is attached to app state
-        assert hasattr(app.state, "limiter"), "Rate limiter should be configured"
-
-    def test_rate_limit_decorator_applied(self):
-        """Test rate limit decorators are applied to endpoints"""
-        from backend.main import app
-
-        # Check key endpoints have rate limiting
-        routes_to_check = [
-            "/",
-            "/health",
-            "/api/mcp/query",
-            "/api/mcp/query/natural-language",
-            "/api/gorgias/webhook",
-            "/api/slack/events",
-            "/admin/sync-sales"
-        ]
-
-        for route in routes_to_check:
-            # Find route in app
-            found = False
-            for app_route in app.routes:
-                if hasattr(app_route, "path") and app_route.path == route:
-                    found = True
-                    # Check endpoint has rate limit decorator
-                    # (This is a simplified check - full test would inspect decorators)
-                    assert app_route.endpoint is not None
-
-            assert found, f"Route {route} should exist"
-
-
-class TestSecurityHeaders:
-    """Test security-related response headers"""
-
-    def test_rate_limit_headers_present(self):
-        """Test rate limit headers are included in responses"""
-        # slowapi automatically adds these headers:
-        # X-RateLimit-Limit
-        # X-RateLimit-Remaining
-        # X-RateLimit-Reset
-        # This would require actual HTTP test
-        pass
-
-
-class TestIntegrationSecurity:
-    """Integration tests for security features"""
-
-    @pytest.mark.asyncio
-    async def test_webhook_rejects_unsigned_request(self):
-        """Test Gorgias webhook rejects unsigned requests"""
-        # This would test the full endpoint with mock request
-        from fastapi import Request
-
-        # Mock request without signature
-        mock_request = AsyncMock(spec=Request)
-        mock_request.body = AsyncMock(return_value=b'{"id": 123}')
-        mock_request.json = AsyncMock(return_value={"id": 123})
-
-        # Would need to import and test the actual endpoint
-        # For now, this is a placeholder for integration testing
-
-    def test_admin_endpoint_requires_valid_key(self, client):
-        """Test admin endpoints require valid admin key"""
-        # Test without admin key
-        response = client.post(
-            "/admin/sync-sales",
-            params={"mode": "dry-run", "admin_key": "wrong_key"}
+@pytest.fixture(scope="module")
+def gorgias_assistant(gorgias_assistant_cls):
+    """
+    One GorgiasAIAssistant shared by the module, Anthropic client patched out
+
+    The patch only needs to cover construction; signature validation never
+    touches the Anthropic client and reads the webhook secret per call.
+    """
+    with patch('integrations.gorgias_ai_assistant.anthropic.Anthropic'):
+        assistant = gorgias_assistant_cls(
+            gorgias_domain="test.gorgias.com",
+            gorgias_username="test@example.com",
+            gorgias_api_key="test_key",
+            analytics_api_url="http://localhost:8000"
         )
 
-        # Admin endpoints check admin_key parameter or X-Admin-Key header
-        # Should return 401 or 403 for invalid key
-        assert response.status_code in [401, 403, 404]  # 404 if endpoint doesn't exist
+    return assistant
+
+
+# Gorgias webhook signature validation (Card 1.4)
+
+@pytest.mark.webhook
+@pytest.mark.parametrize(
+    "case,secret,signature_header,expected",
+    WEBHOOK_SIGNATURE_CASES,
+    ids=[c[0] for c in WEBHOOK_SIGNATURE_CASES]
+)
+def test_validate_webhook_signature(
+    gorgias_assistant, make_sig, monkeypatch, case, secret, signature_header, expected
+):
+    """Test only a correct sha256 signature with a configured secret is accepted"""
+    if signature_header is VALID_SIGNATURE:
+        signature_header = make_sig(WEBHOOK_SECRET, WEBHOOK_PAYLOAD)
+
+    _set_env(monkeypatch, "GORGIAS_WEBHOOK_SECRET", secret)
+
+    is_valid = gorgias_assistant.validate_webhook_signature(WEBHOOK_PAYLOAD, signature_header)
+
+    assert is_valid is expected, f"{case}: expected valid={expected}"
+
+
+@pytest.mark.webhook
+def test_make_sig_matches_hmac_object_api(make_sig):
+    """Test the one-shot make_sig signature equals the longhand hmac.new() form"""
+    expected = hmac.new(
+        key=WEBHOOK_SECRET.encode('utf-8'),
+        msg=WEBHOOK_PAYLOAD,
+        digestmod=hashlib.sha256
+    ).hexdigest()
+
+    assert make_sig(WEBHOOK_SECRET, WEBHOOK_PAYLOAD) == f"sha256={expected}"
+
+
+@pytest.mark.webhook
+@pytest.mark.parametrize("signature_ok", [True, False], ids=["valid", "invalid"])
+def test_validate_uses_constant_time_compare(gorgias_assistant, make_sig, monkeypatch, signature_ok):
+    """Test signatures are compared with hmac.compare_digest, never =="""
+    monkeypatch.setenv("GORGIAS_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    signature_header = make_sig(WEBHOOK_SECRET, WEBHOOK_PAYLOAD)
+    if not signature_ok:
+        signature_header = signature_header[:-1] + ("0" if signature_header[-1] != "0" else "1")
+
+    with patch(
+        'integrations.gorgias_ai_assistant.hmac.compare_digest',
+        wraps=hmac.compare_digest
+    ) as compare_digest:
+        is_valid = gorgias_assistant.validate_webhook_signature(WEBHOOK_PAYLOAD, signature_header)
+
+    assert is_valid is signature_ok
+    compare_digest.assert_called_once()
+
+
+@pytest.fixture(scope="module")
+def app_routes_by_path(app):
+    """{path: route} for the app's routes, built once per module"""
+    return {r.path: r for r in app.routes if hasattr(r, "path")}
+
+
+# Rate limiting is enforced (Card 2)
+
+@pytest.mark.rate_limit
+@pytest.mark.needs_app
+@pytest.mark.slow
+@pytest.mark.usefixtures("reset_limiter")
+def test_rate_limit_enforced_on_root(client):
+    """Test rate limit is enforced on / endpoint (100/hour)"""
+    # Make 101 requests (limiter starts empty, see reset_limiter)
+    responses = [client.get("/").status_code for _ in range(101)]
+
+    # First 100 should succeed
+    assert all(r == 200 for r in responses[:100])
+
+    # 101st should be rate limited
+    assert responses[100] == 429
+
+
+@pytest.mark.rate_limit
+@pytest.mark.needs_app
+def test_rate_limit_configuration_exists(app):
+    """Test rate limiter is configured in app"""
+    # This tests that the rate limiter initialization exists
+    # Check limiter is attached to app state
+    assert hasattr(app.state, "limiter"), "Rate limiter should be configured"
+
+
+@pytest.mark.rate_limit
+@pytest.mark.needs_app
+def test_rate_limit_decorator_applied(app_routes_by_path):
+    """Test rate limit decorators are applied to endpoints"""
+    # Check key endpoints have rate limiting
+    routes_to_check = [
+        "/",
+        "/health",
+        "/api/mcp/query",
+        "/api/mcp/query/natural-language",
+        "/api/gorgias/webhook",
+        "/api/slack/events",
+        "/admin/sync-sales"
+    ]
+
+    for route in routes_to_check:
+        assert route in app_routes_by_path, f"Route {route} should exist"
+
+        # Check endpoint has rate limit decorator
+        # (This is a simplified check - full test would inspect decorators)
+        assert app_routes_by_path[route].endpoint is not None
+
+
+# Security-related response headers
+
+@pytest.mark.rate_limit
+def test_rate_limit_headers_present():
+    """Test rate limit headers are included in responses"""
+    # slowapi automatically adds these headers:
+    # X-RateLimit-Limit
+    # X-RateLimit-Remaining
+    # X-RateLimit-Reset
+    # This would require actual HTTP test
+    pass
+
+
+# Integration tests for security features
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_webhook_rejects_unsigned_request():
+    """Test Gorgias webhook rejects unsigned requests"""
+    # This would test the full endpoint with mock request
+    # Mock request without signature (only the attributes the endpoint reads;
+    # spec=Request would introspect the whole Request class per test)
+    mock_request = Mock()
+    mock_request.headers = {}
+    mock_request.body = AsyncMock(return_value=b'{"id": 123}')
+    mock_request.json = AsyncMock(return_value={"id": 123})
+
+    # Would need to import and test the actual endpoint
+    # For now, this is a placeholder for integration testing
+
+
+@pytest.mark.integration
+@pytest.mark.needs_app
+@pytest.mark.usefixtures("reset_limiter")
+def test_admin_endpoint_requires_valid_key(client):
+    """Test admin endpoints require valid admin key"""
+    # Test without admin key
+    response = client.post(
+        "/admin/sync-sales",
+        params={"mode": "dry-run", "admin_key": "wrong_key"}
+    )
+
+    # Admin endpoints check admin_key parameter or X-Admin-Key header
+    # Should return 401 or 403 for invalid key
+    assert response.status_code in [401, 403, 404]  # 404 if endpoint doesn't exist